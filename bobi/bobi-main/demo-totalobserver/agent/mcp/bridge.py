@@ -2,13 +2,95 @@
 MCP Bridge - Coordinates all MCP tool providers
 Routes tool calls to appropriate clients (real or mock)
 """
-from typing import Dict, Any, Callable
-import traceback
+from typing import Dict, Any, Callable, List, Mapping, Optional, Set, Tuple
+from types import MappingProxyType
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import functools
+import hashlib
+import json
+import threading
+import time
+import logging
+
+try:
+    import orjson
+except ImportError:  # Optional speedup - fall back to stdlib json
+    orjson = None
 
 from .mock_totalobserver import MockTotalObserverClient
 from .mock_crm import MockCRMClient
-from .google_calendar_client import GoogleCalendarClient
-from .gmail_client import GmailClient
+
+log = logging.getLogger(__name__)
+
+# Google clients are imported lazily in MCPBridge.__init__ - the Google
+# libraries are slow to import and unused in mock mode
+
+# Max concurrent tool calls for call_tools_batch (tools are I/O-bound)
+BATCH_MAX_WORKERS = 8
+
+# Max entries in the read-only tool result cache (LRU eviction)
+CACHE_MAX_SIZE = 512
+
+# Default result cache TTL in seconds
+CACHE_DEFAULT_TTL = 300
+
+# Error-loop breaker: FAILURE_THRESHOLD identical failed calls within
+# FAILURE_WINDOW seconds block that call for FAILURE_COOLDOWN seconds
+FAILURE_THRESHOLD = 5
+FAILURE_WINDOW = 60
+FAILURE_COOLDOWN = 60
+
+def dumps_json(obj: Any) -> bytes:
+    """Serialize a JSON value to UTF-8 bytes (orjson if installed)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+# Tool names served by each Google client
+CALENDAR_TOOLS = ("get_calendar_events", "create_event", "check_availability", "reschedule_event")
+GMAIL_TOOLS = (
+    "search_emails", "get_email_thread", "get_email_body",
+    "draft_email", "send_email", "get_recent_emails",
+)
+
+# Tool descriptions for the LLM prompt, in fixed catalog order
+TOOL_DESCRIPTIONS: Dict[str, str] = {
+    # TotalObserver
+    "create_work_order": "Kreira novi radni nalog. Parametri: building_id, issue_type, description, priority, reporter_name?",
+    "get_work_order_status": "Proverava status radnog naloga. Parametri: work_order_id",
+    "list_open_work_orders": "Lista otvorenih radnih naloga. Parametri: building_id?, technician_id?",
+    "assign_technician": "Dodeljuje tehničara radnom nalogu. Parametri: work_order_id, technician_id",
+    "get_building_info": "Informacije o zgradi. Parametri: building_id",
+    "get_technician_availability": "Provera dostupnosti tehničara. Parametri: date?, skill_type?",
+    "update_work_order": "Ažurira radni nalog. Parametri: work_order_id, status?, notes?",
+    "get_tenant_info": "Informacije o zakupcu. Parametri: tenant_name",
+
+    # CRM
+    "search_contacts": "Pretraga kontakata. Parametri: query",
+    "get_contact_details": "Detalji kontakta. Parametri: contact_id",
+    "get_deal_pipeline": "Lista dealova. Parametri: stage?",
+    "log_interaction": "Beleži interakciju. Parametri: contact_id, interaction_type, notes",
+    "create_task": "Kreira zadatak. Parametri: contact_id, title, due_date",
+    "get_company_info": "Informacije o kompaniji. Parametri: company_name",
+
+    # Bridge
+    "batch_execute": "Paralelno poziva više nezavisnih alata. Parametri: calls (lista {tool, arguments, id?, timeoutMs?}), stop_on_error?",
+
+    # Calendar
+    "get_calendar_events": "Lista kalendar događaja. Parametri: start_date?, end_date?, max_results?",
+    "create_event": "Kreira novi event. Parametri: title, start_time, end_time, attendees?, description?",
+    "check_availability": "Provera slobodnih termina. Parametri: date, duration_minutes?",
+    "reschedule_event": "Pomera event. Parametri: event_id, new_start_time",
+
+    # Gmail
+    "search_emails": "Pretraga emailova. Parametri: query, max_results?",
+    "get_email_thread": "Ceo email thread. Parametri: thread_id",
+    "get_email_body": "Nastavak dugog emaila (skraćenog sa ...[truncated]). Parametri: message_id, offset?, length?",
+    "draft_email": "Kreira draft. Parametri: to, subject, body",
+    "send_email": "Šalje email. Parametri: to, subject, body",
+    "get_recent_emails": "Nedavni emailovi. Parametri: from_address?, max_results?",
+}
 
 class MCPBridge:
     """
@@ -16,43 +98,204 @@ class MCPBridge:
     Provides unified interface for agent to call tools
     """
 
-    def __init__(self, use_real_google: bool = True):
+    # Fixed catalog order - never depends on runtime client availability
+    _STATIC_TOOL_ORDER: tuple = tuple(TOOL_DESCRIPTIONS)
+
+    # Read-only tools whose results are safe to cache
+    _IDEMPOTENT_TOOLS: frozenset = frozenset({
+        "get_work_order_status",
+        "list_open_work_orders",
+        "get_building_info",
+        "get_technician_availability",
+        "get_tenant_info",
+        "search_contacts",
+        "get_contact_details",
+        "get_deal_pipeline",
+        "get_company_info",
+        "get_calendar_events",
+        "check_availability",
+        "search_emails",
+        "get_email_thread",
+        "get_email_body",
+        "get_recent_emails",
+    })
+
+    # Per-tool cache TTL in seconds (others use CACHE_DEFAULT_TTL)
+    _CACHE_TTL: Dict[str, float] = {
+        "get_calendar_events": 60,
+        "check_availability": 60,
+        "search_emails": 60,
+        "get_email_thread": 60,
+        "get_recent_emails": 60,
+    }
+
+    # Mutating tools -> read-only tools whose cached results they invalidate
+    _INVALIDATES: Dict[str, tuple] = {
+        "create_work_order": ("get_work_order_status", "list_open_work_orders", "get_building_info"),
+        "assign_technician": ("get_work_order_status", "list_open_work_orders", "get_building_info"),
+        "update_work_order": ("get_work_order_status", "list_open_work_orders", "get_building_info"),
+        "log_interaction": ("search_contacts", "get_contact_details", "get_deal_pipeline", "get_company_info"),
+        "create_task": ("get_contact_details",),
+        "create_event": ("get_calendar_events", "check_availability"),
+        "reschedule_event": ("get_calendar_events", "check_availability"),
+        "draft_email": ("search_emails", "get_email_thread", "get_recent_emails"),
+        "send_email": ("search_emails", "get_email_thread", "get_recent_emails"),
+    }
+
+    def __init__(
+        self,
+        use_real_google: bool = True,
+        tool_allowlist: Optional[Set[str]] = None
+    ):
         """
         Initialize MCP bridge with all clients
 
         Args:
             use_real_google: If True, use real Google APIs (requires OAuth)
                            If False, use mock responses
+            tool_allowlist: If set, only these tools are registered and Google
+                            clients none of them need are never constructed
         """
-        print("[MCP BRIDGE] 🌉 Initializing MCP Bridge...")
+        log.info("🌉 Initializing MCP Bridge...")
+        self._tool_allowlist = frozenset(tool_allowlist) if tool_allowlist is not None else None
 
         # Mock clients (always available)
         self.totalobserver = MockTotalObserverClient()
         self.crm = MockCRMClient()
 
-        # Real Google clients (optional)
-        if use_real_google:
+        # Real Google clients (optional, and only the ones the allowlist needs)
+        self.calendar = None
+        self.gmail = None
+        needs_calendar = self._wants_any(CALENDAR_TOOLS)
+        needs_gmail = self._wants_any(GMAIL_TOOLS)
+
+        if not use_real_google:
+            log.info("⚠ Using mock mode for Google services")
+        elif needs_calendar or needs_gmail:
             try:
-                self.calendar = GoogleCalendarClient()
-                self.gmail = GmailClient()
-                print("[MCP BRIDGE] ✓ Real Google integrations enabled")
+                from .google_auth import GoogleAuth
+                from .google_calendar_client import GoogleCalendarClient
+                from .gmail_client import GmailClient
+
+                # One token + connection pool shared by Calendar and Gmail
+                google_auth = GoogleAuth.shared()
+                if needs_calendar:
+                    self.calendar = GoogleCalendarClient(auth=google_auth)
+                if needs_gmail:
+                    self.gmail = GmailClient(auth=google_auth)
+                log.info("✓ Real Google integrations enabled")
             except Exception as e:
-                print(f"[MCP BRIDGE] ⚠ Failed to init Google clients: {e}")
+                log.warning("⚠ Failed to init Google clients: %s", e)
                 self.calendar = None
                 self.gmail = None
-        else:
-            self.calendar = None
-            self.gmail = None
-            print("[MCP BRIDGE] ⚠ Using mock mode for Google services")
 
-        # Register all tools
+        # Worker pool for parallel tool dispatch (call_tools_batch)
+        self._pool = ThreadPoolExecutor(
+            max_workers=BATCH_MAX_WORKERS,
+            thread_name_prefix="mcp-tool"
+        )
+
+        # Result cache for read-only tools: key -> (expires_at, result)
+        self._cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_stats = {"hits": 0, "misses": 0}
+
+        # In-flight read-only calls: cache key -> Future (single-flight)
+        self._inflight: Dict[tuple, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+        # Recent failure timestamps and cooldowns per call key
+        self._failures: Dict[tuple, deque] = defaultdict(lambda: deque(maxlen=8))
+        self._backoff_until: Dict[tuple, float] = {}
+        self._failures_lock = threading.Lock()
+
+        # Register all tools (runtime additions keep their descriptions here)
+        self._extra_descriptions: Dict[str, str] = {}
         self.tools = self._register_tools()
-        print(f"[MCP BRIDGE] ✓ Registered {len(self.tools)} tools")
+        log.info("✓ Registered %d tools", len(self.tools))
+        self._index_tools()
+
+    def _index_tools(self):
+        """Build the lookup tables and prompt catalog derived from self.tools"""
+        # Hot-path dispatch: one bound dict lookup per call, and an
+        # immutable tool list shared by every "not found" error
+        self._tools_get = self.tools.get
+        self._available_tools = tuple(self.tools)
+
+        # Integer tool ids = position in the static catalog (stable across
+        # sessions), then tools registered at runtime in registration order;
+        # unavailable catalog tools keep their slot as None
+        self._tool_order: tuple = self._STATIC_TOOL_ORDER + tuple(
+            name for name in self.tools if name not in TOOL_DESCRIPTIONS
+        )
+        self._tool_vec: tuple = tuple(self._tools_get(name) for name in self._tool_order)
+        self._tool_ids = {
+            name: i for i, name in enumerate(self._tool_order) if name in self.tools
+        }
+
+        # Built once per tool set, not per prompt/session
+        self._tool_descriptions = MappingProxyType(self._build_tool_descriptions())
+        self._tool_catalog = tuple(
+            (tool_id, name, description)
+            for tool_id, (name, description) in enumerate(self._tool_descriptions.items())
+        )
+        self._unavailable_tools = tuple(
+            name for name in self._STATIC_TOOL_ORDER if name not in self.tools
+        )
+
+    def register_tool(self, name: str, fn: Callable, description: str):
+        """
+        Add (or replace) a tool at runtime
+
+        Tools outside the static catalog get ids and prompt entries after
+        it, so the catalog prefix stays stable.
+        """
+        self.tools[name] = fn
+        self._extra_descriptions[name] = description
+        self._index_tools()
+
+    def invalidate_tool_cache(self):
+        """
+        Rebuild cached tool metadata after self.tools changes at runtime
+
+        register_tool() calls this itself. Callers that cache a prompt
+        built from get_tool_descriptions() must rebuild it too.
+        """
+        self._index_tools()
+
+    def _wants_any(self, tool_names: tuple) -> bool:
+        """True if the allowlist (if any) includes one of these tools"""
+        return self._tool_allowlist is None or not self._tool_allowlist.isdisjoint(tool_names)
 
     def _register_tools(self) -> Dict[str, Callable]:
-        """Register all available tools"""
+        """Register all available tools (filtered by the allowlist, if any)"""
+        tools = self._all_tools()
+        if self._tool_allowlist is None:
+            return tools
+        return {name: fn for name, fn in tools.items() if name in self._tool_allowlist}
+
+    def _all_tools(self) -> Dict[str, Callable]:
+        """All tools the constructed clients provide"""
         return {
             # TotalObserver tools
+            **self._totalobserver_tools(),
+
+            # CRM tools
+            **self._crm_tools(),
+
+            # Bridge tools
+            "batch_execute": self.call_tools_batch,
+
+            # Calendar tools (if available)
+            **(self._calendar_tools() if self.calendar else {}),
+
+            # Gmail tools (if available)
+            **(self._gmail_tools() if self.gmail else {}),
+        }
+
+    def _totalobserver_tools(self) -> Dict[str, Callable]:
+        """Mock TotalObserver tools (serialized - see _serialized)"""
+        return self._serialized({
             "create_work_order": self.totalobserver.create_work_order,
             "get_work_order_status": self.totalobserver.get_work_order_status,
             "list_open_work_orders": self.totalobserver.list_open_work_orders,
@@ -61,21 +304,39 @@ class MCPBridge:
             "get_technician_availability": self.totalobserver.get_technician_availability,
             "update_work_order": self.totalobserver.update_work_order,
             "get_tenant_info": self.totalobserver.get_tenant_info,
+        })
 
-            # CRM tools
+    def _crm_tools(self) -> Dict[str, Callable]:
+        """Mock CRM tools (serialized - see _serialized)"""
+        return self._serialized({
             "search_contacts": self.crm.search_contacts,
             "get_contact_details": self.crm.get_contact_details,
             "get_deal_pipeline": self.crm.get_deal_pipeline,
             "log_interaction": self.crm.log_interaction,
             "create_task": self.crm.create_task,
             "get_company_info": self.crm.get_company_info,
+        })
 
-            # Calendar tools (if available)
-            **(self._calendar_tools() if self.calendar else {}),
+    @staticmethod
+    def _serialized(tools: Dict[str, Callable]) -> Dict[str, Callable]:
+        """
+        Wrap one in-memory client's tools with a shared lock
 
-            # Gmail tools (if available)
-            **(self._gmail_tools() if self.gmail else {}),
-        }
+        The mock clients keep unlocked state (id counters, open-order
+        buckets, lazily loaded data), and batches and sessions call tools
+        from several threads. Their calls take microseconds, so running
+        them one at a time costs nothing.
+        """
+        lock = threading.RLock()
+
+        def locked(fn: Callable) -> Callable:
+            @functools.wraps(fn)
+            def call(**kwargs):
+                with lock:
+                    return fn(**kwargs)
+            return call
+
+        return {name: locked(fn) for name, fn in tools.items()}
 
     def _calendar_tools(self) -> Dict[str, Callable]:
         """Calendar tools (only if service available)"""
@@ -95,6 +356,7 @@ class MCPBridge:
         return {
             "search_emails": self.gmail.search_emails,
             "get_email_thread": self.gmail.get_email_thread,
+            "get_email_body": self.gmail.get_email_body,
             "draft_email": self.gmail.draft_email,
             "send_email": self.gmail.send_email,
             "get_recent_emails": self.gmail.get_recent_emails,
@@ -111,62 +373,349 @@ class MCPBridge:
         Returns:
             Tool result dict
         """
-        if tool_name not in self.tools:
+        return self._call(tool_name, kwargs)
+
+    def _call(self, tool_name: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """call_tool with arguments as a dict (any argument name allowed)"""
+        fn = self._tools_get(tool_name)
+        if fn is None:
             return {
-                "error": f"Tool '{tool_name}' not found. Available: {list(self.tools.keys())}"
+                "error": f"Tool '{tool_name}' not found",
+                "available": self._available_tools
             }
+        return self._dispatch(tool_name, fn, kwargs)
+
+    def call_tool_by_id(self, tool_id: int, **kwargs) -> Dict[str, Any]:
+        """
+        Call a tool by its integer id (see get_tool_ids)
 
+        Ids follow the fixed catalog order, so they are the same in every
+        session and the LLM can reference tools with a short number.
+        """
+        index = self._coerce_tool_id(tool_id)
+        if index is None or self._tool_vec[index] is None:
+            return {
+                "error": f"Tool id {tool_id!r} not found",
+                "available": dict(self._tool_ids)
+            }
+        return self._dispatch(self._tool_order[index], self._tool_vec[index], kwargs)
+
+    def _coerce_tool_id(self, tool_id: Any) -> Optional[int]:
+        """Valid catalog index from an LLM-supplied id (ints often arrive as "3" or 3.0)"""
+        if isinstance(tool_id, str) and tool_id.strip().isdecimal():
+            tool_id = int(tool_id)
+        elif isinstance(tool_id, float) and tool_id.is_integer():
+            tool_id = int(tool_id)
+        if isinstance(tool_id, bool) or not isinstance(tool_id, int):
+            return None
+        if not 0 <= tool_id < len(self._tool_vec):
+            return None
+        return tool_id
+
+    def get_tool_ids(self) -> Mapping[str, int]:
+        """Get tool name -> integer id map for available tools (read-only view)"""
+        return MappingProxyType(self._tool_ids)
+
+    def _dispatch(self, tool_name: str, fn: Callable, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a resolved tool through backoff, cache and invalidation"""
+        key = self._cache_key(tool_name, kwargs)
+
+        # Short-circuit agents stuck retrying the same failing call
+        backoff = self._check_backoff(tool_name, key)
+        if backoff is not None:
+            return backoff
+
+        if tool_name in self._IDEMPOTENT_TOOLS:
+            result = self._call_cached(tool_name, fn, key, kwargs)
+        else:
+            result = self._run_tool(tool_name, fn, kwargs)
+            if tool_name in self._INVALIDATES:
+                self._cache_invalidate(self._INVALIDATES[tool_name])
+
+        self._record_outcome(key, result)
+        return result
+
+    @staticmethod
+    def _is_error(result: Any) -> bool:
+        """True if a tool result is an error payload"""
+        return isinstance(result, dict) and "error" in result
+
+    def _check_backoff(self, tool_name: str, key: tuple) -> Optional[Dict[str, Any]]:
+        """Get terminal error if this exact call is in failure cooldown"""
+        with self._failures_lock:
+            until = self._backoff_until.get(key)
+            if until is None:
+                return None
+            remaining = until - time.monotonic()
+            if remaining <= 0:
+                del self._backoff_until[key]
+                self._failures.pop(key, None)
+                return None
+
+        log.warning("⚠ Tool '%s' in failure cooldown (%.0fs left)", tool_name, remaining)
+        return {
+            "error": (
+                f"Tool '{tool_name}' failed repeatedly with these arguments. "
+                "Stop retrying and tell the user what went wrong."
+            ),
+            "retry": False,
+            "backoff_until": round(time.time() + remaining)
+        }
+
+    def _record_outcome(self, key: tuple, result: Any):
+        """Track failures in a sliding window; start cooldown on error loops"""
+        with self._failures_lock:
+            if not self._is_error(result):
+                self._failures.pop(key, None)
+                return
+
+            now = time.monotonic()
+            self._prune_failures(now)
+            window = self._failures[key]
+            window.append(now)
+            if (len(window) >= FAILURE_THRESHOLD
+                    and window[-1] - window[-FAILURE_THRESHOLD] < FAILURE_WINDOW):
+                self._backoff_until[key] = window[-1] + FAILURE_COOLDOWN
+
+    def _prune_failures(self, now: float):
+        """Forget failure windows and cooldowns that can no longer matter (lock held)"""
+        for key in [k for k, w in self._failures.items() if now - w[-1] >= FAILURE_WINDOW]:
+            del self._failures[key]
+        for key in [k for k, until in self._backoff_until.items() if until <= now]:
+            del self._backoff_until[key]
+
+    def _call_cached(
+        self,
+        tool_name: str,
+        fn: Callable,
+        key: tuple,
+        kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Call a read-only tool through the result cache
+
+        Identical concurrent calls are single-flighted: the first caller
+        runs the tool, later ones wait on its Future instead of hitting
+        the backend again.
+        """
+        cached = self._cache_get(key)
+        if cached is not None:
+            log.debug("✓ Tool '%s' served from cache", tool_name)
+            return cached
+
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not is_owner:
+            log.debug("⏳ Tool '%s' already in flight - waiting", tool_name)
+            return future.result()
+
+        try:
+            result = self._run_tool(tool_name, fn, kwargs)
+            if not self._is_error(result):
+                self._cache_put(tool_name, key, result)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _run_tool(self, tool_name: str, fn: Callable, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Invoke a registered tool, converting exceptions to error results"""
         try:
-            print(f"[MCP BRIDGE] 🔧 Calling tool: {tool_name}")
-            result = self.tools[tool_name](**kwargs)
-            print(f"[MCP BRIDGE] ✓ Tool '{tool_name}' completed")
+            log.debug("🔧 Calling tool: %s", tool_name)
+            result = fn(**kwargs)
+            log.debug("✓ Tool '%s' completed", tool_name)
             return result
 
         except Exception as e:
             error_msg = f"Tool '{tool_name}' failed: {str(e)}"
-            print(f"[MCP BRIDGE] ⚠ {error_msg}")
-            traceback.print_exc()
+            log.exception("⚠ %s", error_msg)
             return {"error": error_msg}
 
+    @staticmethod
+    def _cache_key(tool_name: str, kwargs: Dict[str, Any]) -> tuple:
+        """
+        Call key: (tool name, sorted argument items)
+
+        Arguments are almost always str/int/None, so the tuple itself is a
+        cheap dict key. Unhashable values (e.g. an attendees list) fall back
+        to a digest of the sorted arguments' repr.
+        """
+        key = (tool_name, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            args = repr(sorted(kwargs.items())).encode()
+            key = (tool_name, hashlib.blake2b(args, digest_size=16).hexdigest())
+        return key
+
+    def _cache_get(self, key: tuple) -> Optional[Dict[str, Any]]:
+        """Get unexpired cached result (marks entry as recently used)"""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._cache[key]
+                self._cache_stats["misses"] += 1
+                return None
+            self._cache.move_to_end(key)
+            self._cache_stats["hits"] += 1
+            return entry[1]
+
+    def _cache_put(self, tool_name: str, key: tuple, result: Dict[str, Any]):
+        """Store result, evicting least recently used entries"""
+        ttl = self._CACHE_TTL.get(tool_name, CACHE_DEFAULT_TTL)
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic() + ttl, result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > CACHE_MAX_SIZE:
+                self._cache.popitem(last=False)
+
+    def _cache_invalidate(self, tool_names: tuple):
+        """Drop cached results of the given tools (keys start with the tool name)"""
+        with self._cache_lock:
+            for key in [k for k in self._cache if k[0] in tool_names]:
+                del self._cache[key]
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Get result cache hit/miss counters and current size"""
+        with self._cache_lock:
+            return {**self._cache_stats, "size": len(self._cache)}
+
+    def call_tools_batch(
+        self,
+        calls: List[Dict[str, Any]],
+        stop_on_error: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Call multiple tools, running the read-only ones in parallel
+
+        Wall-clock time for reads is roughly the slowest call instead of
+        the sum, since tool calls are dominated by network I/O. Mutating
+        tools run on the calling thread, one at a time in list order, so
+        a batch never changes state concurrently.
+
+        Args:
+            calls: List of {"tool": name, "arguments": {...}, "id"?, "timeoutMs"?}
+                   (timeoutMs applies to parallel read-only calls)
+            stop_on_error: If True, calls after the first failed call
+                           (in list order) are skipped if they have not
+                           started yet; ones already run report their result
+
+        Returns:
+            List of {"id", "tool", "result"} in the same order as calls
+        """
+        started = time.monotonic()
+
+        # Each entry becomes (future, result, arguments): read-only calls
+        # are submitted up front, mutating ones keep their arguments to run
+        # in order below, and invalid ones get their error straight away -
+        # so one bad entry never sinks the batch
+        entries = []
+        for call in calls:
+            if not isinstance(call, dict):
+                entries.append((None, {"error": "Batch entry must be an object with a 'tool' name"}, None))
+                continue
+            tool_name = call.get("tool")
+            arguments = call.get("arguments") or {}
+            if not isinstance(tool_name, str):
+                entries.append((None, {"error": "Batch entry must be an object with a 'tool' name"}, None))
+            elif not isinstance(arguments, dict):
+                entries.append((None, {"error": f"Arguments for '{tool_name}' must be an object"}, None))
+            elif not isinstance(call.get("timeoutMs") or 0, (int, float)):
+                entries.append((None, {"error": f"timeoutMs for '{tool_name}' must be a number"}, None))
+            elif tool_name == "batch_execute":
+                # Nested batches could starve the shared pool
+                entries.append((None, {"error": "Tool 'batch_execute' cannot be nested inside a batch"}, None))
+            elif tool_name in self._IDEMPOTENT_TOOLS:
+                entries.append((self._pool.submit(self._call, tool_name, arguments), None, None))
+            else:
+                entries.append((None, None, arguments))
+
+        results = []
+        failed = False
+        for index, (call, (future, result, arguments)) in enumerate(zip(calls, entries)):
+            tool_name = call.get("tool") if isinstance(call, dict) else None
+
+            if arguments is not None:
+                if failed:
+                    result = {"error": f"Tool '{tool_name}' skipped: earlier call in batch failed"}
+                else:
+                    result = self._call(tool_name, arguments)
+            elif future is None:
+                pass
+            elif failed and future.cancel():
+                # Only calls that never started count as skipped
+                result = {"error": f"Tool '{tool_name}' skipped: earlier call in batch failed"}
+            else:
+                result = self._batch_result(call, tool_name, future, started)
+
+            if stop_on_error and self._is_error(result):
+                failed = True
+
+            results.append({
+                "id": call.get("id", index) if isinstance(call, dict) else index,
+                "tool": tool_name,
+                "result": result
+            })
+
+        log.debug("✓ Batch of %d tools completed", len(calls))
+        return results
+
+    @staticmethod
+    def _batch_result(call: Dict[str, Any], tool_name: str, future: Future, started: float) -> Dict[str, Any]:
+        """Wait for one batch call, turning timeouts/exceptions into its own error"""
+        timeout_ms = call.get("timeoutMs")
+        timeout = None
+        try:
+            if timeout_ms:
+                # Per-call deadline is measured from batch start
+                timeout = max(0.0, started + timeout_ms / 1000 - time.monotonic())
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            return {"error": f"Tool '{tool_name}' timed out after {timeout_ms}ms"}
+        except Exception as e:
+            log.exception("⚠ Batch call to '%s' failed", tool_name)
+            return {"error": f"Tool '{tool_name}' failed: {e}"}
+
     def get_available_tools(self) -> list:
         """Get list of available tool names"""
         return list(self.tools.keys())
 
-    def get_tool_descriptions(self) -> Dict[str, str]:
-        """Get descriptions of all tools for LLM prompt"""
-        return {
-            # TotalObserver
-            "create_work_order": "Kreira novi radni nalog. Parametri: building_id, issue_type, description, priority, reporter_name?",
-            "get_work_order_status": "Proverava status radnog naloga. Parametri: work_order_id",
-            "list_open_work_orders": "Lista otvorenih radnih naloga. Parametri: building_id?, technician_id?",
-            "assign_technician": "Dodeljuje tehničara radnom nalogu. Parametri: work_order_id, technician_id",
-            "get_building_info": "Informacije o zgradi. Parametri: building_id",
-            "get_technician_availability": "Provera dostupnosti tehničara. Parametri: date?, skill_type?",
-            "update_work_order": "Ažurira radni nalog. Parametri: work_order_id, status?, notes?",
-            "get_tenant_info": "Informacije o zakupcu. Parametri: tenant_name",
-
-            # CRM
-            "search_contacts": "Pretraga kontakata. Parametri: query",
-            "get_contact_details": "Detalji kontakta. Parametri: contact_id",
-            "get_deal_pipeline": "Lista dealova. Parametri: stage?",
-            "log_interaction": "Beleži interakciju. Parametri: contact_id, interaction_type, notes",
-            "create_task": "Kreira zadatak. Parametri: contact_id, title, due_date",
-            "get_company_info": "Informacije o kompaniji. Parametri: company_name",
-
-            # Calendar (if available)
-            **({
-                "get_calendar_events": "Lista kalendar događaja. Parametri: start_date?, end_date?, max_results?",
-                "create_event": "Kreira novi event. Parametri: title, start_time, end_time, attendees?, description?",
-                "check_availability": "Provera slobodnih termina. Parametri: date, duration_minutes?",
-                "reschedule_event": "Pomera event. Parametri: event_id, new_start_time",
-            } if self.calendar else {}),
-
-            # Gmail (if available)
-            **({
-                "search_emails": "Pretraga emailova. Parametri: query, max_results?",
-                "get_email_thread": "Ceo email thread. Parametri: thread_id",
-                "draft_email": "Kreira draft. Parametri: to, subject, body",
-                "send_email": "Šalje email. Parametri: to, subject, body",
-                "get_recent_emails": "Nedavni emailovi. Parametri: from_address?, max_results?",
-            } if self.gmail else {}),
-        }
+    def get_tool_descriptions(self) -> Mapping[str, str]:
+        """Get descriptions of all tools for LLM prompt (read-only view)"""
+        return self._tool_descriptions
+
+    def _build_tool_descriptions(self) -> "OrderedDict[str, str]":
+        """
+        Build the tool catalog for the LLM prompt
+
+        Always lists every tool in _STATIC_TOOL_ORDER, regardless of which
+        clients are available, so the prompt prefix is byte-identical across
+        sessions and LLM prompt caching keeps hitting. Tools registered at
+        runtime follow the catalog. Runtime availability is reported
+        separately by get_unavailable_tools().
+        """
+        descriptions = OrderedDict(
+            (name, TOOL_DESCRIPTIONS[name]) for name in self._STATIC_TOOL_ORDER
+        )
+        for name in self._tool_order[len(self._STATIC_TOOL_ORDER):]:
+            doc = (self.tools[name].__doc__ or "").strip()
+            descriptions[name] = self._extra_descriptions.get(name, doc.split("\n")[0])
+        return descriptions
+
+    def get_tool_catalog(self) -> Tuple[Tuple[int, str, str], ...]:
+        """Get (id, name, description) for every catalog tool, in id order"""
+        return self._tool_catalog
+
+    def get_unavailable_tools(self) -> List[str]:
+        """Get catalog tools not usable in this session (stable order)"""
+        return list(self._unavailable_tools)
@@ -0,0 +1,62 @@
+"""
+ETag Cache - conditional requests for Google API list calls
+Unchanged listings come back as a tiny 304 instead of the full payload
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable
+
+from googleapiclient.errors import HttpError
+
+# Max remembered responses per cache (LRU eviction)
+ETAG_CACHE_SIZE = 128
+
+
+class EtagCache:
+    """Remembers the last ETag and body per request key"""
+
+    def __init__(self, maxsize: int = ETAG_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def execute(self, request, key: Hashable) -> Dict:
+        """
+        Execute a googleapiclient request with If-None-Match
+
+        Args:
+            request: Unexecuted googleapiclient HttpRequest
+            key: Identifies the request parameters (same key = same listing)
+
+        Returns:
+            Response body - the remembered one if the server answers 304
+        """
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached is not None:
+            request.headers['If-None-Match'] = cached[0]
+
+        # Some APIs only send the ETag as a response header
+        response_etag = {}
+        request.add_response_callback(
+            lambda resp: response_etag.update(etag=resp.get('etag'))
+        )
+
+        try:
+            body = request.execute()
+        except HttpError as e:
+            if cached is not None and e.resp.status == 304:
+                with self._lock:
+                    if key in self._entries:
+                        self._entries.move_to_end(key)
+                return cached[1]
+            raise
+
+        etag = body.get('etag') or response_etag.get('etag')
+        if etag:
+            with self._lock:
+                self._entries[key] = (etag, body)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return body
@@ -2,63 +2,109 @@
 Gmail MCP Client - Real Gmail API integration
 Handles email operations: search, read, draft, send
 """
-import os
 import base64
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional
-from pathlib import Path
 from email.mime.text import MIMEText
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
-# Scopes for Gmail
-SCOPES = ['https://www.googleapis.com/auth/gmail.modify']
+from .etag_cache import EtagCache
+from .google_auth import GoogleAuth
+
+# Max sub-requests per Gmail batch call (Gmail recommends <= 50)
+GMAIL_BATCH_SIZE = 50
+
+# Headers read by get_email_thread
+_THREAD_HEADERS = frozenset({'From', 'To', 'Subject', 'Date'})
+
+
+# Max body bytes returned per message (bounds LLM prompt growth)
+MAX_BODY_BYTES = 16 * 1024
+
+# Appended to bodies cut at MAX_BODY_BYTES
+TRUNCATED_MARKER = "...[truncated]"
+
+
+def _plain_body_bytes(payload: Dict) -> bytes:
+    """Get raw text/plain body of a message payload (first matching part)"""
+    parts = payload.get('parts')
+    if parts is not None:
+        part = next((p for p in parts if p['mimeType'] == 'text/plain'), None)
+        data = part['body'].get('data') if part else None
+    else:
+        data = payload.get('body', {}).get('data')
+    return base64.urlsafe_b64decode(data.encode('ascii')) if data else b""
+
+
+def _decode_text(raw: bytes) -> str:
+    """Decode body bytes; malformed or split UTF-8 becomes U+FFFD"""
+    return raw.decode('utf-8', errors='replace')
+
 
 class GmailClient:
     """Real Gmail API client"""
 
-    def __init__(self, credentials_path: Optional[str] = None):
-        self.credentials_path = credentials_path or str(
-            Path(__file__).parent / "credentials.json"
-        )
-        self.token_path = str(Path(__file__).parent / "gmail_token.json")
+    def __init__(
+        self,
+        credentials_path: Optional[str] = None,
+        auth: Optional[GoogleAuth] = None,
+        send_auth: Optional[GoogleAuth] = None
+    ):
+        # Reads use the shared read-only token; send/draft use a separate
+        # narrower-consent token, acquired on the first draft/send call so
+        # read-only sessions never trigger its consent flow
+        self.auth = auth or GoogleAuth.shared(credentials_path)
+        self._credentials_path = credentials_path
+        self.send_auth = send_auth
         self.service = None
+        self._send_service = None
+        self._send_service_built = False
+        self._send_lock = threading.Lock()
+        # Revalidates repeated messages.list calls with If-None-Match
+        self._etags = EtagCache()
         self._authenticate()
 
     def _authenticate(self):
-        """Authenticate with Gmail API"""
-        creds = None
-
-        if os.path.exists(self.token_path):
-            creds = Credentials.from_authorized_user_file(self.token_path, SCOPES)
-
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-            else:
-                if not os.path.exists(self.credentials_path):
-                    print(f"[GMAIL] ⚠ credentials.json not found")
-                    self.service = None
-                    return
-
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    self.credentials_path, SCOPES
-                )
-                creds = flow.run_local_server(port=0)
-
-            with open(self.token_path, 'w') as token:
-                token.write(creds.to_json())
+        """Build the Gmail read service on its Google connection"""
+        self.service = self._build_service(self.auth, "read")
+
+    @property
+    def send_service(self):
+        """Gmail send/draft service, built on first use (None if unavailable)"""
+        if not self._send_service_built:
+            with self._send_lock:
+                if not self._send_service_built:
+                    if self.send_auth is None:
+                        self.send_auth = GoogleAuth.shared(self._credentials_path, profile="gmail_send")
+                    self._send_service = self._build_service(self.send_auth, "send")
+                    self._send_service_built = True
+        return self._send_service
+
+    def _build_service(self, auth: GoogleAuth, purpose: str):
+        """Build a Gmail service for one credential set (None if unavailable)"""
+        if not auth.http:
+            print(f"[GMAIL] ⚠ credentials.json not found ({purpose})")
+            return None
+
+        # Deferred: discovery pulls in a large dependency tree
+        from googleapiclient.discovery import build
 
         try:
-            self.service = build('gmail', 'v1', credentials=creds)
-            print("[GMAIL] ✓ Authenticated with Gmail")
+            # Use the discovery doc bundled with google-api-python-client
+            # instead of fetching it over HTTPS on every construction
+            service = build(
+                'gmail', 'v1',
+                http=auth.http,
+                static_discovery=True,
+                cache_discovery=False
+            )
+            print(f"[GMAIL] ✓ Authenticated with Gmail ({purpose})")
+            return service
         except Exception as e:
-            print(f"[GMAIL] ⚠ Failed to build service: {e}")
-            self.service = None
+            print(f"[GMAIL] ⚠ Failed to build {purpose} service: {e}")
+            return None
 
     def search_emails(
         self,
@@ -70,33 +116,51 @@ class GmailClient:
             return {"error": "Gmail service not available (credentials missing)"}
 
         try:
-            results = self.service.users().messages().list(
-                userId='me',
-                q=query,
-                maxResults=max_results
-            ).execute()
+            results = self._etags.execute(
+                self.service.users().messages().list(
+                    userId='me',
+                    q=query,
+                    maxResults=max_results
+                ),
+                ('messages', query, max_results)
+            )
 
             messages = results.get('messages', [])
 
-            # Get snippet for each message
-            email_summaries = []
-            for msg in messages:
-                msg_data = self.service.users().messages().get(
-                    userId='me',
-                    id=msg['id'],
-                    format='metadata',
-                    metadataHeaders=['From', 'Subject', 'Date']
-                ).execute()
+            # Get snippet for each message - batched into one round-trip
+            summaries = {}
+
+            def on_message(request_id, msg_data, exception):
+                if exception is not None:
+                    print(f"[GMAIL] ⚠ Failed to fetch message {request_id}: {exception}")
+                    return
 
                 headers = {h['name']: h['value'] for h in msg_data.get('payload', {}).get('headers', [])}
-                email_summaries.append({
-                    "id": msg['id'],
-                    "thread_id": msg['threadId'],
+                summaries[request_id] = {
+                    "id": msg_data['id'],
+                    "thread_id": msg_data['threadId'],
                     "from": headers.get('From', ''),
                     "subject": headers.get('Subject', ''),
                     "date": headers.get('Date', ''),
                     "snippet": msg_data.get('snippet', '')
-                })
+                }
+
+            for start in range(0, len(messages), GMAIL_BATCH_SIZE):
+                batch = self.service.new_batch_http_request(callback=on_message)
+                for msg in messages[start:start + GMAIL_BATCH_SIZE]:
+                    batch.add(
+                        self.service.users().messages().get(
+                            userId='me',
+                            id=msg['id'],
+                            format='metadata',
+                            metadataHeaders=['From', 'Subject', 'Date']
+                        ),
+                        request_id=msg['id']
+                    )
+                batch.execute()
+
+            # Keep search result order
+            email_summaries = [summaries[msg['id']] for msg in messages if msg['id'] in summaries]
 
             print(f"[GMAIL] ✓ Found {len(email_summaries)} emails")
             return {
@@ -115,34 +179,29 @@ class GmailClient:
             return {"error": "Gmail service not available"}
 
         try:
+            # threads.get with format='full' already returns every message's
+            # payload, so no per-message fetch is needed
             thread = self.service.users().threads().get(
                 userId='me',
-                id=thread_id
+                id=thread_id,
+                format='full'
             ).execute()
 
             messages = []
-            for msg in thread['messages']:
-                msg_data = self.service.users().messages().get(
-                    userId='me',
-                    id=msg['id'],
-                    format='full'
-                ).execute()
-
-                headers = {h['name']: h['value'] for h in msg_data.get('payload', {}).get('headers', [])}
-
-                # Extract body
-                body = ""
-                if 'parts' in msg_data['payload']:
-                    for part in msg_data['payload']['parts']:
-                        if part['mimeType'] == 'text/plain':
-                            body = base64.urlsafe_b64decode(part['body']['data']).decode()
-                            break
-                else:
-                    if 'body' in msg_data['payload'] and 'data' in msg_data['payload']['body']:
-                        body = base64.urlsafe_b64decode(msg_data['payload']['body']['data']).decode()
+            for msg_data in thread['messages']:
+                payload = msg_data.get('payload', {})
+                headers = {
+                    h['name']: h['value'] for h in payload.get('headers', [])
+                    if h['name'] in _THREAD_HEADERS
+                }
+                raw = _plain_body_bytes(payload)
+                body = _decode_text(raw[:MAX_BODY_BYTES])
+                if len(raw) > MAX_BODY_BYTES:
+                    # Rest is available through get_email_body
+                    body += TRUNCATED_MARKER
 
                 messages.append({
-                    "id": msg['id'],
+                    "id": msg_data['id'],
                     "from": headers.get('From', ''),
                     "to": headers.get('To', ''),
                     "subject": headers.get('Subject', ''),
@@ -162,9 +221,46 @@ class GmailClient:
             print(f"[GMAIL] ⚠ Failed to get thread: {e}")
             return {"error": str(e)}
 
+    def get_email_body(
+        self,
+        message_id: str,
+        offset: int = 0,
+        length: int = MAX_BODY_BYTES
+    ) -> Dict:
+        """Get a byte range of a message's plain-text body (for long emails)"""
+        if not self.service:
+            return {"error": "Gmail service not available"}
+
+        try:
+            msg_data = self.service.users().messages().get(
+                userId='me',
+                id=message_id,
+                format='full'
+            ).execute()
+
+            raw = _plain_body_bytes(msg_data.get('payload', {}))
+            offset = max(0, offset)
+            length = max(0, min(length, MAX_BODY_BYTES))
+            chunk = raw[offset:offset + length]
+
+            print(f"[GMAIL] ✓ Retrieved {len(chunk)} body bytes of {message_id}")
+            return {
+                "success": True,
+                "message_id": message_id,
+                "body": _decode_text(chunk),
+                "offset": offset,
+                "length": len(chunk),
+                "total_bytes": len(raw),
+                "has_more": offset + len(chunk) < len(raw)
+            }
+
+        except HttpError as e:
+            print(f"[GMAIL] ⚠ Failed to get message body: {e}")
+            return {"error": str(e)}
+
     def draft_email(self, to: str, subject: str, body: str) -> Dict:
         """Create email draft"""
-        if not self.service:
+        if not self.send_service:
             return {"error": "Gmail service not available"}
 
         try:
@@ -175,7 +271,7 @@ class GmailClient:
             raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
             draft = {'message': {'raw': raw}}
 
-            draft_result = self.service.users().drafts().create(
+            draft_result = self.send_service.users().drafts().create(
                 userId='me',
                 body=draft
             ).execute()
@@ -193,7 +289,7 @@ class GmailClient:
 
     def send_email(self, to: str, subject: str, body: str) -> Dict:
         """Send email"""
-        if not self.service:
+        if not self.send_service:
             return {"error": "Gmail service not available"}
 
         try:
@@ -203,7 +299,7 @@ class GmailClient:
 
             raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
 
-            sent_message = self.service.users().messages().send(
+            sent_message = self.send_service.users().messages().send(
                 userId='me',
                 body={'raw': raw}
             ).execute()
@@ -0,0 +1,216 @@
+"""
+Shared Google OAuth - one set of credentials for all Google clients
+Gmail and Calendar reuse the same token and pooled HTTP connections
+"""
+import os
+import time
+import threading
+from typing import Dict, List, Optional
+from pathlib import Path
+
+import httplib2
+import google_auth_httplib2
+from google.auth import _helpers
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+
+# Calendar + Gmail read access, shared by both clients' read paths.
+# If modifying these scopes, delete the google_token.json file
+SCOPES = [
+    'https://www.googleapis.com/auth/calendar',
+    'https://www.googleapis.com/auth/gmail.readonly',
+]
+
+# Gmail write access (send + drafts), kept in its own token so the read
+# token never needs the broader consent.
+# If modifying these scopes, delete the gmail_token_send.json file
+GMAIL_SEND_SCOPES = [
+    'https://www.googleapis.com/auth/gmail.send',
+    'https://www.googleapis.com/auth/gmail.compose',
+]
+
+# Named credential sets: profile -> (token file, scopes)
+PROFILES = {
+    "default": ("google_token.json", SCOPES),
+    "gmail_send": ("gmail_token_send.json", GMAIL_SEND_SCOPES),
+}
+
+# Socket timeout (seconds) for Google API requests
+HTTP_TIMEOUT = 20
+
+# Refresh the access token this many seconds before it expires
+REFRESH_MARGIN = 300
+
+# Wait before retrying a failed background refresh (seconds)
+REFRESH_RETRY_DELAY = 30
+
+
+class SharedHttp:
+    """
+    Pooled, authorized HTTP transport shared by all Google services
+
+    httplib2.Http is not thread-safe, so each thread gets its own
+    keep-alive connection pool. Within a thread, Gmail and Calendar
+    calls reuse the same TLS connection to googleapis.com.
+    """
+
+    def __init__(self, credentials: Credentials, timeout: int = HTTP_TIMEOUT):
+        # googleapiclient reads .credentials to refresh tokens on 401
+        self.credentials = credentials
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _authorized_http(self) -> google_auth_httplib2.AuthorizedHttp:
+        """Get (or create) this thread's authorized connection pool"""
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = google_auth_httplib2.AuthorizedHttp(
+                self.credentials,
+                http=httplib2.Http(cache=None, timeout=self.timeout)
+            )
+            self._local.http = http
+        return http
+
+    def request(self, *args, **kwargs):
+        """httplib2-compatible request, routed to the thread's pool"""
+        return self._authorized_http().request(*args, **kwargs)
+
+
+class GoogleAuth:
+    """Loads/refreshes OAuth credentials once for all Google clients"""
+
+    _shared: Dict[str, "GoogleAuth"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        credentials_path: Optional[str] = None,
+        token_path: Optional[str] = None,
+        scopes: Optional[List[str]] = None
+    ):
+        self.credentials_path = credentials_path or str(
+            Path(__file__).parent / "credentials.json"
+        )
+        self.token_path = token_path or str(Path(__file__).parent / "google_token.json")
+        self.scopes = scopes or SCOPES
+        self.creds = None
+        self.http = None
+        self._lock = threading.RLock()
+        self._refresh_thread = None
+        self._authenticate()
+
+    @classmethod
+    def shared(
+        cls,
+        credentials_path: Optional[str] = None,
+        profile: str = "default"
+    ) -> "GoogleAuth":
+        """Get the process-wide auth instance for a profile (created on first use)"""
+        with cls._shared_lock:
+            if profile not in cls._shared:
+                token_file, scopes = PROFILES[profile]
+                cls._shared[profile] = cls(
+                    credentials_path,
+                    token_path=str(Path(__file__).parent / token_file),
+                    scopes=scopes
+                )
+            return cls._shared[profile]
+
+    def _authenticate(self):
+        """Authenticate with Google and build the shared HTTP transport"""
+        creds = None
+
+        # Token file stores user's access and refresh tokens
+        if os.path.exists(self.token_path):
+            creds = Credentials.from_authorized_user_file(self.token_path, self.scopes)
+
+        # If no valid credentials, let user log in
+        if not creds or not creds.valid:
+            if creds and creds.expired and creds.refresh_token:
+                creds.refresh(Request())
+            else:
+                if not os.path.exists(self.credentials_path):
+                    print(f"[GOOGLE AUTH] ⚠ credentials.json not found at {self.credentials_path}")
+                    return
+
+                # Deferred: only needed for first-time interactive consent
+                from google_auth_oauthlib.flow import InstalledAppFlow
+
+                flow = InstalledAppFlow.from_client_secrets_file(
+                    self.credentials_path, self.scopes
+                )
+                creds = flow.run_local_server(port=0)
+
+            # Save credentials for next run
+            self._save_token(creds)
+
+        self.creds = creds
+        # AuthorizedHttp and googleapiclient refresh inline (expired token,
+        # 401) by calling creds.refresh - route every refresh through the lock
+        self._refresh_unlocked = creds.refresh
+        creds.refresh = self._locked_refresh
+        self.http = SharedHttp(creds)
+        print("[GOOGLE AUTH] ✓ Authenticated with Google")
+        self._start_refresh_thread()
+
+    def _save_token(self, creds: Credentials):
+        """Persist credentials atomically (readers never see a partial file)"""
+        tmp_path = f"{self.token_path}.tmp"
+        with open(tmp_path, 'w') as token:
+            token.write(creds.to_json())
+        os.replace(tmp_path, self.token_path)
+
+    def _seconds_until_refresh(self) -> float:
+        """Seconds left before the token enters the refresh margin"""
+        # Credentials.expiry is naive UTC, like google-auth's own clock
+        remaining = (self.creds.expiry - _helpers.utcnow()).total_seconds()
+        return max(0.0, remaining - REFRESH_MARGIN)
+
+    def refresh(self):
+        """
+        Refresh the access token if it is about to expire
+
+        Single-flight: concurrent callers wait on the lock and the
+        ones that lose the race see the fresh token and skip the
+        token endpoint round-trip.
+        """
+        with self._lock:
+            if self.creds.valid and (not self.creds.expiry or self._seconds_until_refresh() > 0):
+                return
+            self.creds.refresh(Request())
+            print("[GOOGLE AUTH] ✓ Refreshed access token")
+
+    def _locked_refresh(self, request):
+        """
+        creds.refresh for every caller, serialized on the auth lock
+
+        Callers that waited while another thread refreshed see a new
+        token and skip their own round-trip to the token endpoint.
+        """
+        stale_token = self.creds.token
+        with self._lock:
+            if self.creds.token != stale_token:
+                return
+            self._refresh_unlocked(request)
+            self._save_token(self.creds)
+
+    def _start_refresh_thread(self):
+        """Refresh in the background so tool calls never block on it"""
+        if not self.creds.expiry or not self.creds.refresh_token:
+            return
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop,
+            name="google-token-refresh",
+            daemon=True
+        )
+        self._refresh_thread.start()
+
+    def _refresh_loop(self):
+        """Sleep until just before expiry, then refresh; repeat"""
+        while True:
+            time.sleep(self._seconds_until_refresh())
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"[GOOGLE AUTH] ⚠ Background token refresh failed: {e}")
+                time.sleep(REFRESH_RETRY_DELAY)
@@ -2,61 +2,76 @@
 Real Google Calendar API - MCP Tool Provider
 Uses Google Calendar API v3 for actual calendar operations
 """
-import os
-from datetime import datetime, timedelta
+import sys
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional
-from pathlib import Path
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
-# If modifying these scopes, delete the token.json file
-SCOPES = ['https://www.googleapis.com/auth/calendar']
+from .etag_cache import EtagCache
+from .google_auth import GoogleAuth
+
+
+if sys.version_info >= (3, 11):
+    # fromisoformat accepts a trailing 'Z' natively
+    _parse_iso = datetime.fromisoformat
+else:
+    def _parse_iso(value: str) -> datetime:
+        """Parse ISO 8601 datetime, including a trailing 'Z' (UTC)"""
+        if value.endswith('Z'):
+            return datetime.fromisoformat(value[:-1] + '+00:00')
+        return datetime.fromisoformat(value)
+
+
+def _event_time(when: Dict) -> datetime:
+    """Parse event start/end ({'dateTime'} or all-day {'date'}) as aware datetime"""
+    value = when.get('dateTime') or when.get('date')
+    parsed = _parse_iso(value)
+    if parsed.tzinfo is None:
+        # All-day events carry a bare date
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _attendee(email: str) -> Dict:
+    """Event attendee entry for an email address"""
+    return {'email': email}
+
 
 class GoogleCalendarClient:
     """Real Google Calendar API client"""
 
-    def __init__(self, credentials_path: Optional[str] = None):
-        self.credentials_path = credentials_path or str(
-            Path(__file__).parent / "credentials.json"
-        )
-        self.token_path = str(Path(__file__).parent / "token.json")
+    def __init__(
+        self,
+        credentials_path: Optional[str] = None,
+        auth: Optional[GoogleAuth] = None
+    ):
+        self.auth = auth or GoogleAuth.shared(credentials_path)
         self.service = None
+        # Revalidates repeated events.list calls with If-None-Match
+        self._etags = EtagCache()
         self._authenticate()
 
     def _authenticate(self):
-        """Authenticate with Google Calendar API"""
-        creds = None
-
-        # Token file stores user's access and refresh tokens
-        if os.path.exists(self.token_path):
-            creds = Credentials.from_authorized_user_file(self.token_path, SCOPES)
-
-        # If no valid credentials, let user log in
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-            else:
-                if not os.path.exists(self.credentials_path):
-                    print(f"[CALENDAR] ⚠ credentials.json not found at {self.credentials_path}")
-                    print("[CALENDAR] ⚠ Using mock mode - no real calendar operations")
-                    self.service = None
-                    return
-
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    self.credentials_path, SCOPES
-                )
-                creds = flow.run_local_server(port=0)
+        """Build Calendar service on the shared Google connection"""
+        if not self.auth.http:
+            print(f"[CALENDAR] ⚠ credentials.json not found at {self.auth.credentials_path}")
+            print("[CALENDAR] ⚠ Using mock mode - no real calendar operations")
+            self.service = None
+            return
 
-            # Save credentials for next run
-            with open(self.token_path, 'w') as token:
-                token.write(creds.to_json())
+        # Deferred: discovery pulls in a large dependency tree
+        from googleapiclient.discovery import build
 
         try:
-            self.service = build('calendar', 'v3', credentials=creds)
+            # Use the discovery doc bundled with google-api-python-client
+            # instead of fetching it over HTTPS on every construction
+            self.service = build(
+                'calendar', 'v3',
+                http=self.auth.http,
+                static_discovery=True,
+                cache_discovery=False
+            )
             print("[CALENDAR] ✓ Authenticated with Google Calendar")
         except Exception as e:
             print(f"[CALENDAR] ⚠ Failed to build service: {e}")
@@ -73,25 +88,30 @@ class GoogleCalendarClient:
             return {"error": "Calendar service not available (credentials missing)"}
 
         try:
-            # Default to today -> 7 days from now
+            # Default to now -> 7 days from now, rounded to the minute so
+            # repeated default calls share an ETag key (and get 304s)
+            now = datetime.utcnow().replace(second=0, microsecond=0)
             if not start_date:
-                start = datetime.utcnow().isoformat() + 'Z'
+                start = now.isoformat() + 'Z'
             else:
                 start = datetime.fromisoformat(start_date).isoformat() + 'Z'
 
             if not end_date:
-                end = (datetime.utcnow() + timedelta(days=7)).isoformat() + 'Z'
+                end = (now + timedelta(days=7)).isoformat() + 'Z'
             else:
                 end = datetime.fromisoformat(end_date).isoformat() + 'Z'
 
-            events_result = self.service.events().list(
-                calendarId='primary',
-                timeMin=start,
-                timeMax=end,
-                maxResults=max_results,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
+            events_result = self._etags.execute(
+                self.service.events().list(
+                    calendarId='primary',
+                    timeMin=start,
+                    timeMax=end,
+                    maxResults=max_results,
+                    singleEvents=True,
+                    orderBy='startTime'
+                ),
+                ('events', start, end, max_results)
+            )
 
             events = events_result.get('items', [])
 
@@ -133,7 +153,8 @@ class GoogleCalendarClient:
             }
 
             if attendees:
-                event['attendees'] = [{'email': email} for email in attendees]
+                # Request body goes through json.dumps, so it must be a list
+                event['attendees'] = list(map(_attendee, attendees))
 
             created_event = self.service.events().insert(
                 calendarId='primary',
@@ -162,38 +183,40 @@ class GoogleCalendarClient:
             start = target_date.replace(hour=9, minute=0).isoformat() + 'Z'
             end = target_date.replace(hour=17, minute=0).isoformat() + 'Z'
 
-            events_result = self.service.events().list(
-                calendarId='primary',
-                timeMin=start,
-                timeMax=end,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
+            events_result = self._etags.execute(
+                self.service.events().list(
+                    calendarId='primary',
+                    timeMin=start,
+                    timeMax=end,
+                    singleEvents=True,
+                    orderBy='startTime'
+                ),
+                ('events', start, end, None)
+            )
 
             events = events_result.get('items', [])
 
             # Simple availability: find gaps between events
             # (This is simplified - real implementation would be more robust)
+            # The query window above is UTC, so compare in UTC
+            current_time = target_date.replace(hour=9, minute=0, tzinfo=timezone.utc)
+            end_time = target_date.replace(hour=17, minute=0, tzinfo=timezone.utc)
+            duration_sec = duration_minutes * 60
+
+            # Parse each event once, then sweep the day in a single pass
+            busy = [(_event_time(event['start']), _event_time(event['end'])) for event in events]
+
             available_slots = []
-            current_time = target_date.replace(hour=9, minute=0)
-            end_time = target_date.replace(hour=17, minute=0)
-
-            for event in events:
-                event_start = datetime.fromisoformat(
-                    event['start'].get('dateTime', event['start'].get('date')).replace('Z', '+00:00')
-                )
-                if (event_start - current_time).seconds >= duration_minutes * 60:
+            for event_start, event_end in busy:
+                if (event_start - current_time).total_seconds() >= duration_sec:
                     available_slots.append({
                         "start": current_time.isoformat(),
                         "end": event_start.isoformat()
                     })
-                event_end = datetime.fromisoformat(
-                    event['end'].get('dateTime', event['end'].get('date')).replace('Z', '+00:00')
-                )
                 current_time = max(current_time, event_end)
 
             # Check if there's time after last event
-            if (end_time - current_time).seconds >= duration_minutes * 60:
+            if (end_time - current_time).total_seconds() >= duration_sec:
                 available_slots.append({
                     "start": current_time.isoformat(),
                     "end": end_time.isoformat()
@@ -223,12 +246,8 @@ class GoogleCalendarClient:
             ).execute()
 
             # Calculate duration
-            old_start = datetime.fromisoformat(
-                event['start'].get('dateTime', event['start'].get('date')).replace('Z', '+00:00')
-            )
-            old_end = datetime.fromisoformat(
-                event['end'].get('dateTime', event['end'].get('date')).replace('Z', '+00:00')
-            )
+            old_start = _event_time(event['start'])
+            old_end = _event_time(event['end'])
             duration = old_end - old_start
 
             # Update times
@@ -3,33 +3,117 @@ Mock CRM (HubSpot-style) - MCP Tool Provider
 Simulates CRM operations: contacts, deals, tasks, interactions
 """
 import json
+from collections import deque
+from functools import cached_property
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:  # Optional speedup - fall back to stdlib json
+    orjson = None
+
+# Substring search index granularity: queries shorter than this scan
+NGRAM_SIZE = 3
+
+# Interactions kept in memory (oldest dropped first), overall and per contact
+MAX_INTERACTIONS = 10000
+MAX_INTERACTIONS_PER_CONTACT = 200
+
 class MockCRMClient:
     """Mock HubSpot-style CRM client for demo"""
 
     def __init__(self):
         self.data_path = Path(__file__).parent.parent.parent / "mock-data"
-        self.contacts = self._load_json("crm_contacts.json")
-        self.interactions = []  # In-memory interaction log
+        self.interactions = deque(maxlen=MAX_INTERACTIONS)  # In-memory interaction log
+        self._interactions_by_contact: Dict[str, deque] = {}
+        self._next_interaction_id = 1
+        self._next_task_id = 1
+
+    # Data files and lookup indexes load on first access, not at construction.
+    # Indexes share the contact dicts, so updates stay visible.
+
+    @cached_property
+    def contacts(self) -> List[Dict]:
+        return self._load_json("crm_contacts.json")
+
+    @cached_property
+    def _by_id(self) -> Dict[str, Dict]:
+        return {c["id"]: c for c in self.contacts}
+
+    @cached_property
+    def _search_fields(self) -> List[tuple]:
+        # (name_lc, company_lc, contact) - lowercased once, not per query
+        return [(c["name"].lower(), c["company"].lower(), c) for c in self.contacts]
+
+    @cached_property
+    def _ngram_index(self) -> Dict[str, set]:
+        # n-gram of name or company -> positions in _search_fields
+        index: Dict[str, set] = {}
+        for i, (name_lc, company_lc, _) in enumerate(self._search_fields):
+            for field in (name_lc, company_lc):
+                for j in range(len(field) - NGRAM_SIZE + 1):
+                    index.setdefault(field[j:j + NGRAM_SIZE], set()).add(i)
+        return index
+
+    @cached_property
+    def _by_company(self) -> Dict[str, List[Dict]]:
+        index: Dict[str, List[Dict]] = {}
+        for c in self.contacts:
+            index.setdefault(c["company"].lower(), []).append(c)
+        return index
+
+    @cached_property
+    def _companies_lc(self) -> List[str]:
+        # Unique lowercased company names, so future partial/fuzzy lookups
+        # scan companies rather than every contact
+        return list(self._by_company)
 
     def _load_json(self, filename: str) -> List[Dict]:
         """Load JSON data file"""
         try:
-            with open(self.data_path / filename, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(self.data_path / filename, 'rb') as f:
+                raw = f.read()
+            return orjson.loads(raw) if orjson is not None else json.loads(raw)
         except Exception as e:
             print(f"[MOCK CRM] ⚠ Failed to load {filename}: {e}")
             return []
 
+    def _search_candidates(self, query_lower: str) -> Optional[List[tuple]]:
+        """
+        Narrow a substring search using the n-gram index
+
+        A contact can only match if its name or company contains every
+        n-gram of the query, so candidates are the intersection of those
+        posting sets (substring check still confirms). Returns None when
+        the query is shorter than NGRAM_SIZE (caller scans everything).
+        """
+        if len(query_lower) < NGRAM_SIZE:
+            return None
+
+        postings = []
+        for j in range(len(query_lower) - NGRAM_SIZE + 1):
+            positions = self._ngram_index.get(query_lower[j:j + NGRAM_SIZE])
+            if not positions:
+                return []
+            postings.append(positions)
+
+        # Smallest set first keeps the intersection cheap
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        return [self._search_fields[i] for i in sorted(candidates)]
+
     def search_contacts(self, query: str) -> Dict:
         """Search contacts by name or company"""
         query_lower = query.lower()
+        fields = self._search_candidates(query_lower)
+        if fields is None:
+            fields = self._search_fields
+
         results = [
-            c for c in self.contacts
-            if query_lower in c["name"].lower() or query_lower in c["company"].lower()
+            c for name_lc, company_lc, c in fields
+            if query_lower in name_lc or query_lower in company_lc
         ]
 
         return {
@@ -40,41 +124,32 @@ class MockCRMClient:
 
     def get_contact_details(self, contact_id: str) -> Dict:
         """Get full contact details"""
-        contact = next((c for c in self.contacts if c["id"] == contact_id), None)
+        contact = self._by_id.get(contact_id)
         if not contact:
             return {"error": f"Contact '{contact_id}' not found"}
 
-        # Get interaction history for this contact
-        contact_interactions = [
-            i for i in self.interactions
-            if i["contact_id"] == contact_id
-        ]
-
         return {
             "success": True,
             "contact": contact,
-            "interaction_history": contact_interactions
+            "interaction_history": list(self._interactions_by_contact.get(contact_id, []))
         }
 
     def get_deal_pipeline(self, stage: Optional[str] = None) -> Dict:
         """Get deals in pipeline"""
-        deals = self.contacts  # Each contact has deal info
-
-        if stage:
-            deals = [c for c in deals if c.get("deal_stage") == stage]
-
-        deal_list = [
-            {
+        # One pass, one lookup per field (each contact has deal info)
+        deal_list = []
+        for c in self.contacts:
+            deal_stage = c.get("deal_stage")
+            if deal_stage is None or (stage and deal_stage != stage):
+                continue
+            deal_list.append({
                 "contact_id": c["id"],
                 "company": c["company"],
                 "contact_name": c["name"],
-                "stage": c.get("deal_stage"),
+                "stage": deal_stage,
                 "value": c.get("deal_value"),
                 "last_contact": c.get("last_contact")
-            }
-            for c in deals
-            if "deal_stage" in c
-        ]
+            })
 
         return {
             "success": True,
@@ -89,12 +164,15 @@ class MockCRMClient:
         notes: str
     ) -> Dict:
         """Log interaction with contact"""
-        contact = next((c for c in self.contacts if c["id"] == contact_id), None)
+        contact = self._by_id.get(contact_id)
         if not contact:
             return {"error": f"Contact '{contact_id}' not found"}
 
+        interaction_id = f"int-{self._next_interaction_id}"
+        self._next_interaction_id += 1
+
         interaction = {
-            "id": f"int-{len(self.interactions) + 1}",
+            "id": interaction_id,
             "contact_id": contact_id,
             "type": interaction_type,
             "notes": notes,
@@ -102,6 +180,12 @@ class MockCRMClient:
         }
 
         self.interactions.append(interaction)
+        history = self._interactions_by_contact.get(contact_id)
+        if history is None:
+            history = self._interactions_by_contact[contact_id] = deque(
+                maxlen=MAX_INTERACTIONS_PER_CONTACT
+            )
+        history.append(interaction)
 
         # Update last_contact on contact
         contact["last_contact"] = interaction["timestamp"]
@@ -120,12 +204,15 @@ class MockCRMClient:
         due_date: str
     ) -> Dict:
         """Create task for contact"""
-        contact = next((c for c in self.contacts if c["id"] == contact_id), None)
+        contact = self._by_id.get(contact_id)
         if not contact:
             return {"error": f"Contact '{contact_id}' not found"}
 
+        task_id = f"task-{self._next_task_id}"
+        self._next_task_id += 1
+
         task = {
-            "id": f"task-{datetime.now().timestamp()}",
+            "id": task_id,
             "contact_id": contact_id,
             "contact_name": contact["name"],
             "title": title,
@@ -143,10 +230,7 @@ class MockCRMClient:
 
     def get_company_info(self, company_name: str) -> Dict:
         """Get company info and associated contacts"""
-        company_contacts = [
-            c for c in self.contacts
-            if c["company"].lower() == company_name.lower()
-        ]
+        company_contacts = self._by_company.get(company_name.lower(), [])
 
         if not company_contacts:
             return {"error": f"Company '{company_name}' not found"}
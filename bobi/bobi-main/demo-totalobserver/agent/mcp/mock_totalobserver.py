@@ -1,30 +1,140 @@
 """Mock TotalObserver API client for demo purposes"""
 
 import json
+from functools import cached_property
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:  # Optional speedup - fall back to stdlib json
+    orjson = None
+
+# Work order statuses
+STATUS_PENDING = "pending"
+STATUS_IN_PROGRESS = "in_progress"
+
+# Work order statuses that count as open
+OPEN_STATUSES = frozenset({STATUS_PENDING, STATUS_IN_PROGRESS})
 
 class MockTotalObserverClient:
     """Mock TotalObserver API client for demo"""
 
     def __init__(self, mock_data_path: str = "../mock-data"):
         self.data_path = Path(__file__).parent.parent.parent / "mock-data"
-        self.buildings = self._load_json("buildings.json")
-        self.technicians = self._load_json("technicians.json")
-        self.work_orders = self._load_json("work_orders.json")
         self._next_wo_id = 1848  # Start from WO-2024-1848
 
+    # Data files and lookup indexes load on first access, not at construction.
+    # Indexes share the record dicts, so updates stay visible.
+
+    @cached_property
+    def buildings(self) -> List[Dict]:
+        return self._load_json("buildings.json")
+
+    @cached_property
+    def technicians(self) -> List[Dict]:
+        return self._load_json("technicians.json")
+
+    @cached_property
+    def work_orders(self) -> List[Dict]:
+        return self._load_json("work_orders.json")
+
+    @cached_property
+    def _buildings_by_id(self) -> Dict[str, Dict]:
+        return {b["id"]: b for b in self.buildings}
+
+    @cached_property
+    def _techs_by_id(self) -> Dict[str, Dict]:
+        return {t["id"]: t for t in self.technicians}
+
+    @cached_property
+    def _wo_by_id(self) -> Dict[str, Dict]:
+        return {w["id"]: w for w in self.work_orders}
+
+    @cached_property
+    def _wo_position(self) -> Dict[str, int]:
+        return {w["id"]: i for i, w in enumerate(self.work_orders)}
+
+    @cached_property
+    def _techs_by_skill(self) -> Dict[str, List[Dict]]:
+        index: Dict[str, List[Dict]] = {}
+        for t in self.technicians:
+            for skill in t["skills"]:
+                index.setdefault(skill, []).append(t)
+        return index
+
+    @cached_property
+    def _available_techs(self) -> List[Dict]:
+        return [t for t in self.technicians if t["available"]]
+
+    # Open work orders per building / technician: id -> work order
+    # (dicts keep creation order, unlike sets)
+
+    @cached_property
+    def _open_wos_by_building(self) -> Dict[str, Dict[str, Dict]]:
+        index: Dict[str, Dict[str, Dict]] = {}
+        for wo in self.work_orders:
+            if wo["status"] in OPEN_STATUSES:
+                index.setdefault(wo["building_id"], {})[wo["id"]] = wo
+        return index
+
+    @cached_property
+    def _open_wos_by_tech(self) -> Dict[str, Dict[str, Dict]]:
+        index: Dict[str, Dict[str, Dict]] = {}
+        for wo in self.work_orders:
+            if wo["status"] in OPEN_STATUSES and wo["assigned_to"]:
+                index.setdefault(wo["assigned_to"], {})[wo["id"]] = wo
+        return index
+
     def _load_json(self, filename: str) -> List[Dict]:
         """Load JSON data file"""
         try:
-            with open(self.data_path / filename, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(self.data_path / filename, 'rb') as f:
+                raw = f.read()
+            return orjson.loads(raw) if orjson is not None else json.loads(raw)
         except Exception as e:
             print(f"[MOCK TO] ⚠ Failed to load {filename}: {e}")
             return []
 
+    def _index_open(self, wo: Dict):
+        """Add a new work order to the open indexes (newest, so it goes last)"""
+        if wo["status"] not in OPEN_STATUSES:
+            return
+        self._open_wos_by_building.setdefault(wo["building_id"], {})[wo["id"]] = wo
+        if wo["assigned_to"]:
+            self._open_wos_by_tech.setdefault(wo["assigned_to"], {})[wo["id"]] = wo
+
+    def _reindex_open(self, wo: Dict, was_open: bool, old_tech: Optional[str]):
+        """Update the open indexes after wo's status/technician changed"""
+        wo_id = wo["id"]
+        is_open = wo["status"] in OPEN_STATUSES
+        new_tech = wo["assigned_to"]
+
+        # Building bucket only changes when the order opens or closes, so a
+        # status change between open statuses keeps its place
+        if was_open and not is_open:
+            self._open_wos_by_building.get(wo["building_id"], {}).pop(wo_id, None)
+        elif is_open and not was_open:
+            self._insert_open(self._open_wos_by_building.setdefault(wo["building_id"], {}), wo)
+
+        tech_changed = was_open != is_open or old_tech != new_tech
+        if tech_changed and was_open and old_tech:
+            self._open_wos_by_tech.get(old_tech, {}).pop(wo_id, None)
+        if tech_changed and is_open and new_tech:
+            self._insert_open(self._open_wos_by_tech.setdefault(new_tech, {}), wo)
+
+    def _insert_open(self, bucket: Dict[str, Dict], wo: Dict):
+        """Add wo to an open bucket, keeping buckets in work_orders order"""
+        bucket[wo["id"]] = wo
+        position = self._wo_position
+        ids = list(bucket)
+        if len(ids) > 1 and position[ids[-2]] > position[wo["id"]]:
+            ordered = sorted(bucket.values(), key=lambda w: position[w["id"]])
+            bucket.clear()
+            bucket.update((w["id"], w) for w in ordered)
+
     def create_work_order(
         self,
         building_id: str,
@@ -35,7 +145,7 @@ class MockTotalObserverClient:
     ) -> Dict:
         """Create new work order"""
         # Find building
-        building = next((b for b in self.buildings if b["id"] == building_id), None)
+        building = self._buildings_by_id.get(building_id)
         if not building:
             return {"error": f"Building '{building_id}' not found"}
 
@@ -50,7 +160,7 @@ class MockTotalObserverClient:
             "issue_type": issue_type,
             "description": description,
             "priority": priority,
-            "status": "pending",
+            "status": STATUS_PENDING,
             "assigned_to": None,
             "assigned_to_name": None,
             "created_at": datetime.now().isoformat(),
@@ -58,6 +168,9 @@ class MockTotalObserverClient:
         }
 
         self.work_orders.append(work_order)
+        self._wo_by_id[wo_id] = work_order
+        self._wo_position[wo_id] = len(self.work_orders) - 1
+        self._index_open(work_order)
 
         print(f"[MOCK TO] ✓ Created work order {wo_id}")
         return {
@@ -68,7 +181,7 @@ class MockTotalObserverClient:
 
     def get_work_order_status(self, work_order_id: str) -> Dict:
         """Get work order status"""
-        wo = next((w for w in self.work_orders if w["id"] == work_order_id), None)
+        wo = self._wo_by_id.get(work_order_id)
         if not wo:
             return {"error": f"Work order '{work_order_id}' not found"}
 
@@ -83,16 +196,18 @@ class MockTotalObserverClient:
         technician_id: Optional[str] = None
     ) -> Dict:
         """List open work orders"""
-        filtered = [
-            wo for wo in self.work_orders
-            if wo["status"] in ["pending", "in_progress"]
-        ]
-
+        # Filtered queries only touch that building's/technician's open orders
         if building_id:
-            filtered = [wo for wo in filtered if wo["building_id"] == building_id]
-
-        if technician_id:
-            filtered = [wo for wo in filtered if wo["assigned_to"] == technician_id]
+            filtered = list(self._open_wos_by_building.get(building_id, {}).values())
+            if technician_id:
+                filtered = [wo for wo in filtered if wo["assigned_to"] == technician_id]
+        elif technician_id:
+            filtered = list(self._open_wos_by_tech.get(technician_id, {}).values())
+        else:
+            filtered = [
+                wo for wo in self.work_orders
+                if wo["status"] in OPEN_STATUSES
+            ]
 
         return {
             "success": True,
@@ -102,17 +217,19 @@ class MockTotalObserverClient:
 
     def assign_technician(self, work_order_id: str, technician_id: str) -> Dict:
         """Assign technician to work order"""
-        wo = next((w for w in self.work_orders if w["id"] == work_order_id), None)
+        wo = self._wo_by_id.get(work_order_id)
         if not wo:
             return {"error": f"Work order '{work_order_id}' not found"}
 
-        tech = next((t for t in self.technicians if t["id"] == technician_id), None)
+        tech = self._techs_by_id.get(technician_id)
         if not tech:
             return {"error": f"Technician '{technician_id}' not found"}
 
+        was_open, old_tech = wo["status"] in OPEN_STATUSES, wo["assigned_to"]
         wo["assigned_to"] = technician_id
         wo["assigned_to_name"] = tech["name"]
-        wo["status"] = "in_progress"
+        wo["status"] = STATUS_IN_PROGRESS
+        self._reindex_open(wo, was_open, old_tech)
 
         print(f"[MOCK TO] ✓ Assigned {tech['name']} to {work_order_id}")
         return {
@@ -123,21 +240,18 @@ class MockTotalObserverClient:
 
     def get_building_info(self, building_id: str) -> Dict:
         """Get building information"""
-        building = next((b for b in self.buildings if b["id"] == building_id), None)
+        building = self._buildings_by_id.get(building_id)
         if not building:
             return {"error": f"Building '{building_id}' not found"}
 
-        # Get work orders for this building
-        building_wos = [
-            wo for wo in self.work_orders
-            if wo["building_id"] == building_id and wo["status"] in ["pending", "in_progress"]
-        ]
+        # Open work orders for this building, straight from the index
+        building_wos = self._open_wos_by_building.get(building_id, {})
 
         return {
             "success": True,
             "building": building,
             "open_work_orders": len(building_wos),
-            "recent_issues": building_wos[:5]  # Last 5
+            "recent_issues": list(islice(building_wos.values(), 5))  # Last 5
         }
 
     def get_technician_availability(
@@ -146,10 +260,10 @@ class MockTotalObserverClient:
         skill_type: Optional[str] = None
     ) -> Dict:
         """Get available technicians"""
-        filtered = [t for t in self.technicians if t["available"]]
-
         if skill_type:
-            filtered = [t for t in filtered if skill_type in t["skills"]]
+            filtered = [t for t in self._techs_by_skill.get(skill_type, []) if t["available"]]
+        else:
+            filtered = list(self._available_techs)
 
         return {
             "success": True,
@@ -157,6 +271,22 @@ class MockTotalObserverClient:
             "count": len(filtered)
         }
 
+    def set_technician_availability(self, technician_id: str, available: bool) -> Dict:
+        """Mark a technician (un)available, keeping the availability index in sync"""
+        tech = self._techs_by_id.get(technician_id)
+        if not tech:
+            return {"error": f"Technician '{technician_id}' not found"}
+
+        if tech["available"] != available:
+            tech["available"] = available
+            self._available_techs = [t for t in self.technicians if t["available"]]
+
+        print(f"[MOCK TO] ✓ {tech['name']} available={available}")
+        return {
+            "success": True,
+            "technician": tech
+        }
+
     def update_work_order(
         self,
         work_order_id: str,
@@ -164,12 +294,14 @@ class MockTotalObserverClient:
         notes: Optional[str] = None
     ) -> Dict:
         """Update work order status"""
-        wo = next((w for w in self.work_orders if w["id"] == work_order_id), None)
+        wo = self._wo_by_id.get(work_order_id)
         if not wo:
             return {"error": f"Work order '{work_order_id}' not found"}
 
         if status:
+            was_open = wo["status"] in OPEN_STATUSES
             wo["status"] = status
+            self._reindex_open(wo, was_open, wo["assigned_to"])
         if notes:
             wo["notes"] = notes
 
@@ -0,0 +1,241 @@
+"""Tests for MCPBridge dispatch, result cache and failure cooldown"""
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mcp import bridge as bridge_module
+from mcp.bridge import MCPBridge
+
+
+class ToolIdTest(unittest.TestCase):
+    def setUp(self):
+        self.bridge = MCPBridge(use_real_google=False)
+        self.search_id = self.bridge.get_tool_ids()["search_contacts"]
+
+    def test_ids_match_catalog(self):
+        for tool_id, name, _ in self.bridge.get_tool_catalog():
+            if name in self.bridge.tools:
+                self.assertEqual(self.bridge.get_tool_ids()[name], tool_id)
+
+    def test_llm_style_ids_are_accepted(self):
+        for tool_id in (self.search_id, str(self.search_id), float(self.search_id)):
+            result = self.bridge.call_tool_by_id(tool_id, query="drag")
+            self.assertEqual(result["count"], 1, tool_id)
+
+    def test_bad_ids_return_errors(self):
+        unavailable = self.bridge.get_unavailable_tools()[0]
+        unavailable_id = next(
+            tool_id for tool_id, name, _ in self.bridge.get_tool_catalog() if name == unavailable
+        )
+        for tool_id in ("x", "²", None, True, -1, 999, [1], "1.5", unavailable_id):
+            result = self.bridge.call_tool_by_id(tool_id, query="drag")
+            self.assertIn("not found", result["error"], tool_id)
+
+    def test_runtime_tool_follows_catalog(self):
+        catalog = self.bridge.get_tool_catalog()
+        self.bridge.register_tool("echo", lambda text: {"success": True, "text": text}, "Echo. Parametri: text")
+
+        tool_id = self.bridge.get_tool_ids()["echo"]
+        self.assertEqual(tool_id, len(catalog))
+        self.assertEqual(self.bridge.get_tool_catalog()[:len(catalog)], catalog)
+        self.assertEqual(self.bridge.get_tool_catalog()[-1], (tool_id, "echo", "Echo. Parametri: text"))
+        self.assertEqual(self.bridge.call_tool_by_id(tool_id, text="hi")["text"], "hi")
+
+
+class CountingTool:
+    """Wraps a tool function and counts calls"""
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, **kwargs):
+        with self.lock:
+            self.calls += 1
+        return self.fn(**kwargs)
+
+
+class ResultCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.bridge = MCPBridge(use_real_google=False)
+        self.search = self._count("search_contacts")
+
+    def _count(self, tool_name):
+        tool = CountingTool(self.bridge.tools[tool_name])
+        self.bridge.tools[tool_name] = tool
+        self.bridge.invalidate_tool_cache()
+        return tool
+
+    def test_repeated_read_is_served_from_cache(self):
+        first = self.bridge.call_tool("search_contacts", query="drag")
+        second = self.bridge.call_tool("search_contacts", query="drag")
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.search.calls, 1)
+        stats = self.bridge.get_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (1, 1, 1))
+
+    def test_argument_order_does_not_matter(self):
+        self.bridge.call_tool("get_technician_availability", date="2024-02-05", skill_type="HVAC")
+        self.bridge.call_tool("get_technician_availability", skill_type="HVAC", date="2024-02-05")
+        self.assertEqual(self.bridge.get_cache_stats()["hits"], 1)
+
+    def test_errors_are_not_cached(self):
+        status = self._count("get_work_order_status")
+        for _ in range(2):
+            self.bridge.call_tool("get_work_order_status", work_order_id="nope")
+        self.assertEqual(status.calls, 2)
+
+    def test_entries_expire_after_ttl(self):
+        now = time.monotonic()
+        with mock.patch.object(bridge_module.time, "monotonic", return_value=now):
+            self.bridge.call_tool("search_contacts", query="drag")
+        with mock.patch.object(
+            bridge_module.time, "monotonic", return_value=now + bridge_module.CACHE_DEFAULT_TTL + 1
+        ):
+            self.bridge.call_tool("search_contacts", query="drag")
+        self.assertEqual(self.search.calls, 2)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        with mock.patch.object(bridge_module, "CACHE_MAX_SIZE", 2):
+            self.bridge.call_tool("search_contacts", query="a")
+            self.bridge.call_tool("search_contacts", query="b")
+            self.bridge.call_tool("search_contacts", query="a")  # refresh "a"
+            self.bridge.call_tool("search_contacts", query="c")  # evicts "b"
+            self.assertEqual(self.search.calls, 3)
+
+            self.bridge.call_tool("search_contacts", query="a")
+            self.assertEqual(self.search.calls, 3)
+            self.bridge.call_tool("search_contacts", query="b")
+            self.assertEqual(self.search.calls, 4)
+            self.assertEqual(self.bridge.get_cache_stats()["size"], 2)
+
+    def test_mutating_tool_invalidates_dependent_reads(self):
+        before = self.bridge.call_tool("list_open_work_orders")["count"]
+        self.bridge.call_tool("get_deal_pipeline")
+        self.bridge.call_tool(
+            "create_work_order",
+            building_id="plaza-mall",
+            issue_type="HVAC",
+            description="Klima ne radi",
+            priority="high"
+        )
+
+        self.assertEqual(self.bridge.call_tool("list_open_work_orders")["count"], before + 1)
+        # Unrelated cached reads survive
+        self.assertEqual(self.bridge.get_cache_stats()["hits"], 0)
+        self.bridge.call_tool("get_deal_pipeline")
+        self.assertEqual(self.bridge.get_cache_stats()["hits"], 1)
+
+    def test_concurrent_identical_calls_run_once(self):
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow_search(**kwargs):
+            started.set()
+            release.wait(timeout=5)
+            return {"success": True, "count": 0}
+
+        tool = self._count("search_contacts")
+        tool.fn = slow_search
+        results = []
+
+        def call():
+            results.append(self.bridge.call_tool("search_contacts", query="drag"))
+
+        threads = [threading.Thread(target=call) for _ in range(5)]
+        threads[0].start()
+        started.wait(timeout=5)
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.05)  # let the others reach the in-flight wait
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        self.assertEqual(tool.calls, 1)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertEqual(self.bridge._inflight, {})
+
+
+class FailureCooldownTest(unittest.TestCase):
+    def setUp(self):
+        self.bridge = MCPBridge(use_real_google=False)
+        self.status = CountingTool(self.bridge.tools["get_work_order_status"])
+        self.bridge.tools["get_work_order_status"] = self.status
+        self.bridge.invalidate_tool_cache()
+
+    def _fail(self, times, work_order_id="nope"):
+        return [
+            self.bridge.call_tool("get_work_order_status", work_order_id=work_order_id)
+            for _ in range(times)
+        ]
+
+    def test_repeated_failures_start_cooldown(self):
+        self._fail(bridge_module.FAILURE_THRESHOLD)
+        blocked = self._fail(1)[0]
+
+        self.assertIs(blocked["retry"], False)
+        self.assertEqual(self.status.calls, bridge_module.FAILURE_THRESHOLD)
+
+        # Other arguments are not affected
+        self._fail(1, work_order_id="other")
+        self.assertEqual(self.status.calls, bridge_module.FAILURE_THRESHOLD + 1)
+
+    def test_success_resets_failure_count(self):
+        self._fail(bridge_module.FAILURE_THRESHOLD - 1)
+        self.bridge.tools["get_work_order_status"] = lambda **kwargs: {"success": True}
+        self.bridge.invalidate_tool_cache()
+        self.bridge.call_tool("get_work_order_status", work_order_id="nope")
+        self.bridge._cache.clear()
+
+        self.bridge.tools["get_work_order_status"] = self.status
+        self.bridge.invalidate_tool_cache()
+        results = self._fail(bridge_module.FAILURE_THRESHOLD - 1)
+        self.assertNotIn("retry", results[-1])
+
+    def test_cooldown_expires(self):
+        now = time.monotonic()
+        with mock.patch.object(bridge_module.time, "monotonic", return_value=now):
+            self._fail(bridge_module.FAILURE_THRESHOLD)
+            self.assertIs(self._fail(1)[0]["retry"], False)
+
+        later = now + bridge_module.FAILURE_COOLDOWN + 1
+        with mock.patch.object(bridge_module.time, "monotonic", return_value=later):
+            result = self._fail(1)[0]
+        self.assertNotIn("retry", result)
+        self.assertEqual(self.status.calls, bridge_module.FAILURE_THRESHOLD + 1)
+
+    def test_stale_failures_are_forgotten(self):
+        now = time.monotonic()
+        with mock.patch.object(bridge_module.time, "monotonic", return_value=now):
+            for contact_id in ("typo-1", "typo-2", "typo-3"):
+                self.bridge.call_tool("get_contact_details", contact_id=contact_id)
+        self.assertEqual(len(self.bridge._failures), 3)
+
+        later = now + bridge_module.FAILURE_WINDOW + 1
+        with mock.patch.object(bridge_module.time, "monotonic", return_value=later):
+            self.bridge.call_tool("get_contact_details", contact_id="typo-4")
+        self.assertEqual(len(self.bridge._failures), 1)
+
+    def test_expired_cooldowns_are_forgotten(self):
+        now = time.monotonic()
+        with mock.patch.object(bridge_module.time, "monotonic", return_value=now):
+            self._fail(bridge_module.FAILURE_THRESHOLD)
+        self.assertEqual(len(self.bridge._backoff_until), 1)
+
+        later = now + bridge_module.FAILURE_COOLDOWN + 1
+        with mock.patch.object(bridge_module.time, "monotonic", return_value=later):
+            self._fail(1, work_order_id="other")
+        self.assertEqual(len(self.bridge._backoff_until), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+"""Tests for MCPBridge.call_tools_batch (run: python -m unittest discover tests)"""
+import sys
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mcp.bridge import MCPBridge
+
+
+CREATE_WO = {
+    "tool": "create_work_order",
+    "arguments": {
+        "building_id": "plaza-mall",
+        "issue_type": "HVAC",
+        "description": "Klima ne radi",
+        "priority": "high",
+    },
+}
+
+
+class CallToolsBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.bridge = MCPBridge(use_real_google=False)
+
+    def _add_read_tools(self, **tools):
+        # Treated as read-only, so the batch runs them in parallel
+        self.bridge.tools.update(tools)
+        self.bridge._IDEMPOTENT_TOOLS = self.bridge._IDEMPOTENT_TOOLS | set(tools)
+        self.bridge.invalidate_tool_cache()
+
+    def _wo_count(self) -> int:
+        return len(self.bridge.totalobserver.work_orders)
+
+    def test_stop_on_error_reports_real_result_of_calls_that_ran(self):
+        second_done = threading.Event()
+
+        def slow_fail():
+            # Fail only after the next call in the batch has finished
+            second_done.wait(timeout=5)
+            return {"error": "boom"}
+
+        def mark():
+            second_done.set()
+            return {"success": True}
+
+        self._add_read_tools(slow_fail=slow_fail, mark=mark)
+        results = self.bridge.call_tools_batch(
+            [{"tool": "slow_fail"}, {"tool": "mark"}],
+            stop_on_error=True
+        )
+
+        self.assertEqual(results[0]["result"], {"error": "boom"})
+        self.assertEqual(results[1]["result"], {"success": True})
+
+    def test_stop_on_error_skips_reads_that_never_started(self):
+        # Single busy worker: the read stays queued until released
+        release = threading.Event()
+        self.bridge._pool = ThreadPoolExecutor(max_workers=1)
+        self.bridge._pool.submit(release.wait, 5)
+        try:
+            results = self.bridge.call_tools_batch(
+                [
+                    {"tool": "search_contacts", "arguments": [1]},
+                    {"tool": "search_contacts", "arguments": {"query": "drag"}},
+                ],
+                stop_on_error=True
+            )
+        finally:
+            release.set()
+            self.bridge._pool.shutdown(wait=True)
+
+        self.assertIn("must be an object", results[0]["result"]["error"])
+        self.assertIn("skipped", results[1]["result"]["error"])
+
+    def test_stop_on_error_skips_mutations_after_failure(self):
+        before = self._wo_count()
+        results = self.bridge.call_tools_batch(
+            [
+                {"tool": "get_work_order_status", "arguments": {"work_order_id": "nope"}},
+                CREATE_WO,
+            ],
+            stop_on_error=True
+        )
+
+        self.assertIn("skipped", results[1]["result"]["error"])
+        self.assertEqual(self._wo_count(), before)
+
+    def test_mutations_run_in_order_with_unique_ids(self):
+        results = self.bridge.call_tools_batch([CREATE_WO] * 6 + [
+            {"tool": "assign_technician",
+             "arguments": {"work_order_id": "WO-2024-1853", "technician_id": "tech-002"}},
+        ])
+
+        ids = [r["result"]["work_order"]["id"] for r in results[:6]]
+        self.assertEqual(ids, [f"WO-2024-{n}" for n in range(1848, 1854)])
+        self.assertTrue(results[6]["result"]["success"])
+
+    def test_concurrent_batches_get_unique_ids(self):
+        ids = []
+        lock = threading.Lock()
+
+        def run_batch():
+            results = self.bridge.call_tools_batch(
+                [CREATE_WO, {"tool": "list_open_work_orders"}] * 5
+            )
+            with lock:
+                ids.extend(r["result"]["work_order"]["id"] for r in results[::2])
+
+        threads = [threading.Thread(target=run_batch) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        self.assertEqual(len(ids), 20)
+        self.assertEqual(len(set(ids)), 20)
+
+    def test_bad_entries_fail_individually(self):
+        results = self.bridge.call_tools_batch([
+            "search_contacts",
+            {"tool": "search_contacts", "arguments": {"tool_name": "x", "query": "drag"}},
+            {"tool": "search_contacts", "arguments": {"query": "drag"}, "id": "ok"},
+            {"tool": "search_contacts", "arguments": ["drag"]},
+            {"tool": "batch_execute", "arguments": {"calls": []}},
+            {"tool": "get_deal_pipeline", "timeoutMs": "soon"},
+            {"arguments": {}},
+        ])
+
+        self.assertEqual(len(results), 7)
+        for index in (0, 1, 3, 4, 5, 6):
+            self.assertIn("error", results[index]["result"], results[index])
+        self.assertEqual(results[2]["id"], "ok")
+        self.assertEqual(results[2]["result"]["count"], 1)
+
+    def test_timeout_is_per_call(self):
+        release = threading.Event()
+
+        def hang():
+            release.wait(timeout=5)
+            return {"success": True}
+
+        self._add_read_tools(hang=hang)
+        try:
+            results = self.bridge.call_tools_batch([
+                {"tool": "hang", "timeoutMs": 50},
+                {"tool": "get_deal_pipeline"},
+            ])
+        finally:
+            release.set()
+
+        self.assertIn("timed out", results[0]["result"]["error"])
+        self.assertTrue(results[1]["result"]["success"])
+
+
+if __name__ == "__main__":
+    unittest.main()
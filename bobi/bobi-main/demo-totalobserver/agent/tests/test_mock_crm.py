@@ -0,0 +1,33 @@
+"""Tests for MockCRMClient contact search"""
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mcp.mock_crm import MockCRMClient
+
+
+class SearchContactsTest(unittest.TestCase):
+    def setUp(self):
+        self.client = MockCRMClient()
+
+    def _scan(self, query):
+        query = query.lower()
+        return [
+            c["id"] for c in self.client.contacts
+            if query in c["name"].lower() or query in c["company"].lower()
+        ]
+
+    def test_index_matches_plain_scan(self):
+        text = " ".join(f"{c['name']} {c['company']}" for c in self.client.contacts)
+        queries = {text[i:i + n] for i in range(len(text)) for n in range(10)}
+        queries |= {"", "zzz", "MARKO", "ko pe", "a-b"}
+
+        for query in sorted(queries):
+            found = [c["id"] for c in self.client.search_contacts(query)["contacts"]]
+            self.assertEqual(found, self._scan(query), query)
+
+
+if __name__ == "__main__":
+    unittest.main()
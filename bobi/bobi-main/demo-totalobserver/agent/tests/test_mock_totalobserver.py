@@ -0,0 +1,68 @@
+"""Tests for MockTotalObserverClient open work order indexes"""
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mcp.mock_totalobserver import MockTotalObserverClient
+
+
+class OpenWorkOrderOrderTest(unittest.TestCase):
+    def setUp(self):
+        self.client = MockTotalObserverClient()
+        for description in ("Lift stoji", "Curi voda"):
+            self.client.create_work_order(
+                building_id="plaza-mall",
+                issue_type="General",
+                description=description,
+                priority="medium"
+            )
+
+    def _ids(self, **filters):
+        return [wo["id"] for wo in self.client.list_open_work_orders(**filters)["work_orders"]]
+
+    def _assert_views_agree(self):
+        unfiltered = [i for i in self._ids() if self.client._wo_by_id[i]["building_id"] == "plaza-mall"]
+        self.assertEqual(self._ids(building_id="plaza-mall"), unfiltered)
+        recent = self.client.get_building_info("plaza-mall")["recent_issues"]
+        self.assertEqual([wo["id"] for wo in recent], unfiltered[:5])
+
+    def test_assign_keeps_creation_order(self):
+        self.client.assign_technician("WO-2024-1847", "tech-002")
+        self.assertEqual(
+            self._ids(building_id="plaza-mall"),
+            ["WO-2024-1847", "WO-2024-1848", "WO-2024-1849"]
+        )
+        self._assert_views_agree()
+
+    def test_status_change_between_open_statuses_keeps_order(self):
+        self.client.update_work_order("WO-2024-1847", status="pending")
+        self.assertEqual(self._ids(building_id="plaza-mall")[0], "WO-2024-1847")
+        self._assert_views_agree()
+
+    def test_reopened_order_returns_to_its_place(self):
+        self.client.update_work_order("WO-2024-1847", status="completed")
+        self.assertNotIn("WO-2024-1847", self._ids(building_id="plaza-mall"))
+        self.assertNotIn("WO-2024-1847", self._ids(technician_id="tech-001"))
+
+        self.client.update_work_order("WO-2024-1847", status="in_progress")
+        self.assertEqual(self._ids(building_id="plaza-mall")[0], "WO-2024-1847")
+        self.assertIn("WO-2024-1847", self._ids(technician_id="tech-001"))
+        self._assert_views_agree()
+
+    def test_reassign_moves_between_technicians_in_order(self):
+        self.client.assign_technician("WO-2024-1849", "tech-002")
+        self.client.assign_technician("WO-2024-1848", "tech-002")
+        self.assertEqual(self._ids(technician_id="tech-002"), ["WO-2024-1848", "WO-2024-1849"])
+
+        self.client.assign_technician("WO-2024-1847", "tech-002")
+        self.assertEqual(self._ids(technician_id="tech-001"), [])
+        self.assertEqual(
+            self._ids(technician_id="tech-002"),
+            ["WO-2024-1847", "WO-2024-1848", "WO-2024-1849"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
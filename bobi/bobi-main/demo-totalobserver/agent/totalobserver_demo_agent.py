@@ -10,7 +10,15 @@ Serbian language for demo
 """
 import os
 import asyncio
+import atexit
+import functools
 import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
@@ -18,6 +26,7 @@ from dotenv import load_dotenv
 from livekit.agents import (
     AutoSubscribe,
     JobContext,
+    JobProcess,
     WorkerOptions,
     cli,
     llm,
@@ -27,7 +36,7 @@ from livekit.plugins import google
 from livekit import api, rtc
 
 # Import MCP Bridge
-from mcp.bridge import MCPBridge
+from mcp.bridge import MCPBridge, dumps_json
 
 # Import prompts
 from prompts.totalobserver_instructions import TOTALOBSERVER_FULL_INSTRUCTIONS
@@ -36,21 +45,68 @@ load_dotenv()
 
 # Configuration
 USE_REAL_GOOGLE = os.getenv("USE_REAL_GOOGLE", "true").lower() == "true"
+GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 LIVEKIT_URL = os.getenv("LIVEKIT_URL")
 LIVEKIT_API_KEY = os.getenv("LIVEKIT_API_KEY")
 LIVEKIT_API_SECRET = os.getenv("LIVEKIT_API_SECRET")
-
-# Initialize MCP Bridge (global - shared across all sessions)
-print(f"[DEMO AGENT] Initializing MCP Bridge (real_google={USE_REAL_GOOGLE})...")
-mcp_bridge = MCPBridge(use_real_google=USE_REAL_GOOGLE)
+MCP_LOG_LEVEL = os.getenv("MCP_LOG_LEVEL", "INFO").upper()
+
+# livekit CLI commands that actually run the agent (and so need Gemini)
+AGENT_RUN_COMMANDS = frozenset({"start", "dev", "console", "connect"})
+
+def setup_mcp_logging() -> logging.handlers.QueueListener:
+    """Route MCP logs through a queue so handler I/O runs off tool-call threads"""
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("[%(name)s] %(message)s"))
+
+    mcp_logger = logging.getLogger("mcp")
+    mcp_logger.setLevel(MCP_LOG_LEVEL)
+    mcp_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    mcp_logger.propagate = False
+
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+setup_mcp_logging()
+
+# MCP Bridge (global - shared across all sessions). Created in prewarm() as
+# each job process starts, not at import, and never on the job's event loop
+_mcp_bridge = None
+_mcp_bridge_lock = threading.Lock()
+
+def get_mcp_bridge() -> MCPBridge:
+    """Get the shared MCP Bridge, initializing it on first use"""
+    global _mcp_bridge
+    if _mcp_bridge is None:
+        with _mcp_bridge_lock:
+            if _mcp_bridge is None:
+                print(f"[DEMO AGENT] Initializing MCP Bridge (real_google={USE_REAL_GOOGLE})...")
+                _mcp_bridge = MCPBridge(use_real_google=USE_REAL_GOOGLE)
+    return _mcp_bridge
 
 def build_system_prompt_with_tools() -> str:
     """Build system prompt that includes MCP tool descriptions"""
-    tools_desc = mcp_bridge.get_tool_descriptions()
+    mcp_bridge = get_mcp_bridge()
+    catalog = mcp_bridge.get_tool_catalog()
 
-    tools_section = "\n=== DOSTUPNI ALATI (MCP TOOLS) ===\n"
-    for tool_name, description in tools_desc.items():
-        tools_section += f"- {tool_name}: {description}\n"
+    # "[id] name: description" - ids are stable catalog positions
+    tools_section = "\n=== DOSTUPNI ALATI (MCP TOOLS) ===\n" + "".join(
+        f"- [{tool_id}] {tool_name}: {description}\n"
+        for tool_id, tool_name, description in catalog
+    )
+    example_id = next(tool_id for tool_id, name, _ in catalog if name == "create_work_order")
+
+    # Static catalog first (cacheable prompt prefix), runtime availability last
+    unavailable = mcp_bridge.get_unavailable_tools()
+    availability_section = ""
+    if unavailable:
+        availability_section = (
+            "\n=== NEDOSTUPNI ALATI (u ovoj sesiji) ===\n"
+            + ", ".join(unavailable) + "\n"
+        )
 
     return f"""
 {TOTALOBSERVER_FULL_INSTRUCTIONS}
@@ -64,54 +120,101 @@ Kada pozivaš alat, koristi funkciju call_tool() sa:
 
 Primer:
 call_tool(tool_name="create_work_order", building_id="plaza-mall", issue_type="HVAC", description="Klima ne radi", priority="high")
-"""
 
-async def broadcast_tool_call(room: rtc.Room, tool_name: str, params: dict, result: dict):
-    """Broadcast tool call to demo UI"""
-    try:
-        data = json.dumps({
-            "type": "tool_call",
-            "tool_name": tool_name,
-            "params": params,
-            "result": result,
-            "timestamp": datetime.now().isoformat()
-        })
-
-        await room.local_participant.publish_data(
-            data.encode('utf-8'),
-            reliable=True,
-            destination_identities=[]
-        )
-        print(f"[BROADCAST] ✓ Tool call broadcast: {tool_name}")
-    except Exception as e:
-        print(f"[BROADCAST] ⚠ Failed to broadcast tool call: {e}")
+Kraće: call_tool_by_id() sa tool_id = broj u zagradama iz liste alata:
+call_tool_by_id(tool_id={example_id}, building_id="plaza-mall", issue_type="HVAC", description="Klima ne radi", priority="high")
+{availability_section}"""
+
+# Constant leading bytes of each data-channel message (serialized once)
+_TOOL_CALL_PREFIX = b'{"type":"tool_call","tool_name":'
+_TRANSCRIPT_PREFIX = b'{"type":"transcript","speaker":'
+
+def tool_call_message(tool_name: str, params: dict, result: dict) -> bytes:
+    """Build the tool_call message for the demo UI"""
+    return b"".join((
+        _TOOL_CALL_PREFIX, dumps_json(tool_name),
+        b',"params":', dumps_json(params),
+        b',"result":', dumps_json(result),
+        b',"timestamp":', dumps_json(datetime.now().isoformat()),
+        b"}",
+    ))
 
-async def broadcast_transcript(room: rtc.Room, speaker: str, text: str):
-    """Broadcast transcript to demo UI"""
-    try:
-        data = json.dumps({
-            "type": "transcript",
-            "speaker": speaker,
-            "text": text,
-            "timestamp": datetime.now().isoformat()
-        })
-
-        await room.local_participant.publish_data(
-            data.encode('utf-8'),
-            reliable=True,
-            destination_identities=[]
-        )
-        print(f"[BROADCAST] ✓ Transcript broadcast: {speaker}")
-    except Exception as e:
-        print(f"[BROADCAST] ⚠ Failed to broadcast: {e}")
+def transcript_message(speaker: str, text: str) -> bytes:
+    """Build the transcript message for the demo UI"""
+    return b"".join((
+        _TRANSCRIPT_PREFIX, dumps_json(speaker),
+        b',"text":', dumps_json(text),
+        b',"timestamp":', dumps_json(datetime.now().isoformat()),
+        b"}",
+    ))
 
-# Define MCP tool function for Gemini
+async def broadcast_worker(room: rtc.Room, queue: asyncio.Queue):
+    """
+    Publish queued demo-UI messages in order
+
+    Event handlers enqueue (data, label) pairs and return immediately;
+    this single consumer owns all publish_data calls for the room.
+    """
+    while True:
+        data, label = await queue.get()
+        try:
+            await room.local_participant.publish_data(
+                data,
+                reliable=True,
+                destination_identities=[]
+            )
+            print(f"[BROADCAST] ✓ {label}")
+        except Exception as e:
+            print(f"[BROADCAST] ⚠ Failed to broadcast {label}: {e}")
+
+@functools.lru_cache(maxsize=1)
+def get_system_prompt() -> str:
+    """
+    System prompt, built once per worker (tools and instructions are static)
+
+    If bridge tools change at runtime, call invalidate_tool_cache() on the
+    bridge and then get_system_prompt.cache_clear().
+    """
+    return build_system_prompt_with_tools()
+
+# Recent tool results: returned JSON string -> result dict, so the
+# function_call_completed handler can skip parsing what we just serialized
+RECENT_RESULTS_SIZE = 32
+_recent_results: "OrderedDict[str, dict]" = OrderedDict()
+
+def lookup_tool_result(result_json: str) -> dict:
+    """Get the dict behind a tool result string (parse only on a miss)"""
+    result = _recent_results.pop(result_json, None)
+    if result is None:
+        return json.loads(result_json)
+    return result
+
+def remember_tool_result(result: dict) -> str:
+    """Serialize a tool result for Gemini, keeping the dict for the broadcast"""
+    result_json = dumps_json(result).decode('utf-8')
+
+    _recent_results[result_json] = result
+    if len(_recent_results) > RECENT_RESULTS_SIZE:
+        _recent_results.popitem(last=False)
+
+    print(f"[MCP CALL] ✓ Result: {result_json}")
+    return result_json
+
+# Define MCP tool functions for Gemini
 async def call_mcp_tool_wrapper(tool_name: str, **kwargs):
     """Wrapper function that Gemini can call to invoke MCP tools"""
     print(f"[MCP CALL] 🔧 Gemini calling: {tool_name}(**{kwargs})")
-    result = mcp_bridge.call_tool(tool_name, **kwargs)
-    print(f"[MCP CALL] ✓ Result: {result}")
-    return json.dumps(result, ensure_ascii=False)
+    return remember_tool_result(get_mcp_bridge().call_tool(tool_name, **kwargs))
+
+async def call_mcp_tool_by_id_wrapper(tool_id: int, **kwargs):
+    """Same as call_mcp_tool_wrapper, addressing the tool by catalog id"""
+    print(f"[MCP CALL] 🔧 Gemini calling tool #{tool_id}(**{kwargs})")
+    return remember_tool_result(get_mcp_bridge().call_tool_by_id(tool_id, **kwargs))
+
+def prewarm(proc: JobProcess):
+    """Build the MCP Bridge and system prompt before the process takes a job"""
+    get_mcp_bridge()
+    get_system_prompt()
 
 async def entrypoint(ctx: JobContext):
     """Main agent entrypoint"""
@@ -120,6 +223,9 @@ async def entrypoint(ctx: JobContext):
     print(f"🏢 TOTALOBSERVER DEMO AGENT")
     print(f"{'='*60}")
     print(f"Room: {room_name}")
+    # Normally already built by prewarm(); otherwise build off the event loop
+    # (Google auth may refresh tokens or wait on interactive consent)
+    mcp_bridge = await asyncio.to_thread(get_mcp_bridge)
     print(f"MCP Tools: {len(mcp_bridge.get_available_tools())}")
     print(f"Real Google: {USE_REAL_GOOGLE}")
     print(f"{'='*60}\n")
@@ -128,17 +234,16 @@ async def entrypoint(ctx: JobContext):
     await ctx.connect(auto_subscribe=AutoSubscribe.AUDIO_ONLY)
 
     # Build system prompt with tool descriptions
-    system_prompt = build_system_prompt_with_tools()
+    system_prompt = await asyncio.to_thread(get_system_prompt)
 
     # Create Gemini Realtime model
-    google_api_key = os.getenv("GOOGLE_API_KEY")
-    if not google_api_key:
+    if not GOOGLE_API_KEY:
         print("[ERROR] GOOGLE_API_KEY nije postavljen!")
         return
 
     realtime_model = google.beta.realtime.RealtimeModel(
         model="gemini-2.5-flash-native-audio-preview-09-2025",
-        api_key=google_api_key,
+        api_key=GOOGLE_API_KEY,
         voice="Charon",  # Serbian-sounding voice
         language="sr-RS",
         temperature=0.7,
@@ -166,7 +271,17 @@ async def entrypoint(ctx: JobContext):
 
     # Register MCP tool calling function
     agent.register_function("call_tool", call_mcp_tool_wrapper)
-    print("[OK] MCP tool function registered")
+    agent.register_function("call_tool_by_id", call_mcp_tool_by_id_wrapper)
+    print("[OK] MCP tool functions registered")
+
+    # Broadcasts to the demo UI go through one background publisher
+    broadcast_q: asyncio.Queue = asyncio.Queue()
+    broadcast_task = asyncio.create_task(broadcast_worker(ctx.room, broadcast_q))
+
+    async def stop_broadcast_worker():
+        broadcast_task.cancel()
+
+    ctx.add_shutdown_callback(stop_broadcast_worker)
 
     # Hook into agent events for broadcasting
     @session.on("user_input_transcribed")
@@ -184,7 +299,9 @@ async def entrypoint(ctx: JobContext):
         if transcript and transcript.strip():
             print(f"[🎤 USER] {transcript}")
             # Broadcast to UI
-            asyncio.create_task(broadcast_transcript(ctx.room, "User", transcript))
+            broadcast_q.put_nowait((
+                transcript_message("User", transcript), "Transcript broadcast: User"
+            ))
         else:
             print(f"[DEBUG] Empty or invalid transcript")
 
@@ -201,7 +318,9 @@ async def entrypoint(ctx: JobContext):
             if transcript and transcript.strip():
                 print(f"[🤖 AGENT] {transcript}")
                 # Broadcast to UI
-                asyncio.create_task(broadcast_transcript(ctx.room, "Agent", transcript))
+                broadcast_q.put_nowait((
+                    transcript_message("Agent", transcript), "Transcript broadcast: Agent"
+                ))
             else:
                 print(f"[DEBUG] Empty or invalid agent transcript")
         else:
@@ -216,11 +335,13 @@ async def entrypoint(ctx: JobContext):
         print(f"[DEBUG] Result: {event.result}")
 
         # Broadcast tool call to UI
-        asyncio.create_task(broadcast_tool_call(
-            ctx.room,
-            event.function_name,
-            event.arguments or {},
-            json.loads(event.result) if event.result else {}
+        broadcast_q.put_nowait((
+            tool_call_message(
+                event.function_name,
+                event.arguments or {},
+                lookup_tool_result(event.result) if event.result else {}
+            ),
+            f"Tool call broadcast: {event.function_name}"
         ))
 
     print("[OK] Event hooks attached")
@@ -233,22 +354,22 @@ async def entrypoint(ctx: JobContext):
     # Let Gemini Realtime handle the greeting with proactivity
     print("[GREETING] 🎯 Gemini Realtime proactivity enabled - agent will speak first")
 
-    # Brief pause to let audio stream establish
-    await asyncio.sleep(0.5)
-
-    # Track execution of proactivity
-    agent_has_spoken = False
+    # Track execution of proactivity (hooked before the pause so an
+    # early greeting isn't missed)
+    agent_spoke = asyncio.Event()
 
     @session.on("agent_started_speaking")
     def intro_callback():
-        nonlocal agent_has_spoken
-        agent_has_spoken = True
+        agent_spoke.set()
         print("[GREETING] ✅ Agent started speaking (Proactivity worked)")
 
-    # Wait for proactivity to trigger
-    await asyncio.sleep(3.0)
+    # Brief pause to let audio stream establish
+    await asyncio.sleep(0.5)
 
-    if not agent_has_spoken:
+    # Wait for proactivity to trigger - returns as soon as the agent speaks
+    try:
+        await asyncio.wait_for(agent_spoke.wait(), timeout=3.0)
+    except asyncio.TimeoutError:
         print("[GREETING] ⚠️ Proactivity didn't trigger in 3s - FORCING GREETING")
         greeting_text = "Dobar dan! Ja sam AI asistent za TotalObserver. Kako mogu da pomognem?"
         asyncio.create_task(session.say(greeting_text))
@@ -264,7 +385,14 @@ if __name__ == "__main__":
     print("  Language: Serbian")
     print("=" * 70)
 
+    # Fail at worker start-up, not once per job - but only for commands that
+    # run the agent (e.g. download-files doesn't need Gemini)
+    if not GOOGLE_API_KEY and len(sys.argv) > 1 and sys.argv[1] in AGENT_RUN_COMMANDS:
+        print("[ERROR] GOOGLE_API_KEY nije postavljen!")
+        raise SystemExit(1)
+
     cli.run_app(WorkerOptions(
         entrypoint_fnc=entrypoint,
+        prewarm_fnc=prewarm,
         agent_name="totalobserver-demo"
     ))